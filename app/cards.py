@@ -0,0 +1,96 @@
+from html import escape
+
+import numpy as np
+import pandas as pd
+
+# Number of result cards rendered per page on the Home page
+PAGE_SIZE = 20
+
+# Placeholder in a cached card where a search relevance score is inserted
+RELEVANCE_SLOT = "<!--relevance-->"
+
+CARD_TEMPLATE = """
+<div style="border: 1px solid #dddddd; padding: 15px; margin-bottom: 20px; border-radius: 10px;">
+    <h3 style="color: yellow;">{title}</h3>
+    <ul>{points}</ul>
+    <p><strong>Price:</strong> <span style="color: {price_color};">{price}</span></p>
+    <p><strong>Rating:</strong> <span style="color: #FFD700;">{rating} ⭐</span></p>
+    <p><strong>Duration:</strong> {duration} minutes</p>
+    {relevance}
+    <a href="{url}" target="_blank" style="
+        display: inline-block;
+        background-color: #007BFF;
+        color: white;
+        padding: 8px 16px;
+        text-decoration: none;
+        border-radius: 5px;
+        font-weight: bold;
+        margin-top: 10px;">Access Course</a>
+</div>
+"""
+
+
+def _description_points(description):
+    """
+    Splits a description into the sentences shown as bullet points.
+    """
+    if not isinstance(description, str):
+        return ""
+    return "".join(f"<li>{escape(point.strip())}</li>" for point in description.split('.') if point.strip())
+
+
+def _format_rating(rating):
+    """
+    Rating as shown on a card; courses without ratings show "N/A".
+    """
+    return "N/A" if pd.isna(rating) else str(rating)
+
+
+def build_course_cards(courses):
+    """
+    Renders the result card of every course once. Returns an object array of
+    HTML strings whose positions match the rows of `courses`. Catalog text is
+    HTML-escaped, since the cards are rendered as raw HTML.
+    """
+    cards = [
+        CARD_TEMPLATE.format(
+            title=escape(str(title)),
+            points=_description_points(description),
+            price_color='#228B22' if price == 'Free' else '#FF8C00',
+            price=escape(str(price)),
+            rating=_format_rating(rating),
+            duration=duration,
+            relevance=RELEVANCE_SLOT,
+            url=escape(str(url)),
+        )
+        for title, description, price, rating, duration, url in zip(
+            courses['course_title'], courses['course_description'], courses['price'],
+            courses['course_rating'], courses['course_duration'], courses['course_url'],
+        )
+    ]
+    return np.array(cards, dtype=object)
+
+
+def page_count(total, page_size=PAGE_SIZE):
+    """
+    Number of pages needed for `total` results (at least one).
+    """
+    return max(1, -(-total // page_size))
+
+
+def render_page(cards, rows, page, scores=None, page_size=PAGE_SIZE):
+    """
+    HTML for the cards of result page `page` (1-based). `rows` are the catalog
+    positions of the results, best first; `scores`, if given, are shown as the
+    relevance of each result. Only the visible page is assembled, so the cost
+    does not depend on the number of results.
+    """
+    start = (page - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    if scores is None:
+        return "".join(cards[page_rows])
+    page_scores = scores[start:start + page_size]
+    return "".join(
+        card.replace(RELEVANCE_SLOT, f"<p><strong>Relevance:</strong> {score:.3f}</p>")
+        for card, score in zip(cards[page_rows], page_scores)
+    )
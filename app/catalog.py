@@ -0,0 +1,221 @@
+import codecs
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import cached_property
+
+import pandas as pd
+
+from cards import build_course_cards
+from filters import build_filter_index
+from stats import build_catalog_stats
+from text_index import build_text_index
+
+# Default location of the typed course catalog, relative to the project root.
+# It is built from the scraped CSV with scripts/build_catalog.py.
+DATA_PATH = "data/courses_data_final.parquet"
+SOURCE_CSV_PATH = "data/courses_data_final.csv"
+
+# The scraped CSV is UTF-8 with a few stray Windows-1252 bytes from older exports
+CSV_ENCODING = "utf-8"
+CSV_ERRORS = "cp1252_fallback"
+
+# Low-cardinality columns stored as categoricals
+CATEGORICAL_COLUMNS = ["course_level", "price"]
+
+CatalogCacheInfo = namedtuple("CatalogCacheInfo", ["hits", "misses", "currsize"])
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """
+    A parsed, typed snapshot of the course catalog.
+    `version` is the content hash of the source file, so two snapshots with the
+    same version hold identical data.
+    """
+    path: str
+    mtime_ns: int
+    size: int
+    version: str
+    frame: pd.DataFrame
+
+    @property
+    def courses(self):
+        """
+        Returns a shallow view of the courses. Under pandas 3 copy-on-write (the
+        default; requirements.txt pins pandas>=3), a caller writing to it gets its
+        own copy instead of mutating the shared frame.
+        """
+        return self.frame.copy(deep=False)
+
+    @cached_property
+    def filter_index(self):
+        """
+        Sidebar filter masks and sorted columns, built once per catalog snapshot.
+        """
+        return build_filter_index(self.frame)
+
+    @cached_property
+    def text_index(self):
+        """
+        BM25 inverted index over titles, descriptions and curricula for keyword
+        search and suggestions, built once per catalog snapshot.
+        """
+        return build_text_index(self.frame)
+
+    @cached_property
+    def cards(self):
+        """
+        Result card HTML of every course, rendered once per catalog snapshot so
+        a page of results is a lookup instead of string formatting per rerun.
+        """
+        return build_course_cards(self.frame)
+
+    @cached_property
+    def stats(self):
+        """
+        Counts, rating distributions and featured courses, computed once per
+        catalog snapshot for the sidebar and the visualizations page.
+        """
+        return build_catalog_stats(self.frame)
+
+    def warm(self):
+        """
+        Builds the filter masks, keyword index and result cards now, so the
+        first search after a catalog (re)load does not pay for them.
+        """
+        self.filter_index, self.text_index, self.cards
+        return self
+
+    def __len__(self):
+        return len(self.frame)
+
+
+# Process-wide cache: one parsed catalog per absolute path, shared by every session
+_cache = {}
+_cache_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def _cp1252_fallback(error):
+    """
+    Decode error handler: bytes that are not valid UTF-8 are read as
+    Windows-1252 (Latin-1 for the five bytes it leaves undefined).
+    """
+    chars = []
+    for byte in error.object[error.start:error.end]:
+        try:
+            chars.append(bytes([byte]).decode("cp1252"))
+        except UnicodeDecodeError:
+            chars.append(chr(byte))
+    return "".join(chars), error.end
+
+
+codecs.register_error(CSV_ERRORS, _cp1252_fallback)
+
+
+def parse_catalog_csv(raw_bytes):
+    """
+    Parses the raw bytes of a scraped catalog CSV into a typed DataFrame:
+    nullable numerics ('N/A' ratings and 'No reviews' become missing values
+    instead of strings), categoricals for price and level, and UTF-8 text.
+    """
+    df = pd.read_csv(io.StringIO(raw_bytes.decode(CSV_ENCODING, errors=CSV_ERRORS)))
+    df["course_rating"] = pd.to_numeric(df["course_rating"], errors="coerce").astype("Float64")
+    df["reviews"] = pd.to_numeric(df["reviews"], errors="coerce").astype("Int64")
+    df["lesson_count"] = pd.to_numeric(df["lesson_count"], errors="coerce").fillna(0).astype("int32")
+    df["course_duration"] = pd.to_numeric(df["course_duration"], errors="coerce").fillna(0).astype("int32")
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def write_catalog(courses, path=DATA_PATH):
+    """
+    Writes a typed catalog frame as Parquet. Column types, including the
+    nullable numerics and categoricals, are restored as-is on load.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    courses.to_parquet(path, index=False, compression="zstd")
+
+
+def _parse_catalog(raw_bytes, path):
+    """
+    Parses a catalog file: the typed Parquet catalog, or a scraped CSV, which
+    is typed the same way on the fly.
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(io.BytesIO(raw_bytes))
+    return parse_catalog_csv(raw_bytes)
+
+
+def read_catalog(path=DATA_PATH):
+    """
+    Reads a catalog file into a fresh typed DataFrame, bypassing the cache.
+    For scripts that transform the catalog; the app uses load_catalog().
+    """
+    with open(path, "rb") as f:
+        return _parse_catalog(f.read(), path)
+
+
+def load_catalog(path=DATA_PATH):
+    """
+    Returns the cached catalog for `path`, parsing the file only when it is new
+    or its contents changed. A changed mtime with an unchanged content hash is
+    still a cache hit.
+    """
+    global _hits, _misses
+
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    cached = _cache.get(key)
+    if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+        with _cache_lock:
+            _hits += 1
+        return cached
+
+    with _cache_lock:
+        # Another session may have reloaded the file while we waited for the lock
+        cached = _cache.get(key)
+        if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            _hits += 1
+            return cached
+
+        with open(key, "rb") as f:
+            raw_bytes = f.read()
+        version = hashlib.sha1(raw_bytes).hexdigest()
+
+        if cached is not None and cached.version == version:
+            # Touched but not modified: keep the parsed frame, remember the new mtime
+            catalog = Catalog(key, stat.st_mtime_ns, stat.st_size, version, cached.frame)
+            _hits += 1
+        else:
+            catalog = Catalog(key, stat.st_mtime_ns, stat.st_size, version, _parse_catalog(raw_bytes, key))
+            _misses += 1
+
+        _cache[key] = catalog
+        return catalog
+
+
+def cache_info():
+    """
+    Reports catalog cache hits, misses and the number of cached files.
+    """
+    with _cache_lock:
+        return CatalogCacheInfo(_hits, _misses, len(_cache))
+
+
+def cache_clear():
+    """
+    Drops every cached catalog and resets the counters.
+    """
+    global _hits, _misses
+    with _cache_lock:
+        _cache.clear()
+        _hits = 0
+        _misses = 0
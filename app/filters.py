@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Options offered by the sidebar filters on the Home page
+COURSE_TYPES = ["All", "Free", "Paid"]
+COURSE_LEVELS = ["All", "Beginner", "Intermediate", "Advanced"]
+
+
+@dataclass(frozen=True)
+class FilterIndex:
+    """
+    Precomputed lookup structures for the sidebar filters.
+    Price and level are stored as boolean masks; rating and duration as sorted
+    values plus the row order that sorts them, so a minimum threshold is a single
+    binary search. Courses without a rating or duration are left out of the
+    sorted arrays and never pass a minimum filter.
+    """
+    size: int
+    is_free: np.ndarray
+    level_masks: dict
+    rating_sorted: np.ndarray
+    rating_order: np.ndarray
+    duration_sorted: np.ndarray
+    duration_order: np.ndarray
+
+
+def _sorted_with_order(values):
+    """
+    Returns the known (non-missing) values in ascending order and their row positions.
+    """
+    values = values.to_numpy(dtype="float64", na_value=np.nan)
+    known = np.flatnonzero(~np.isnan(values))
+    order = known[np.argsort(values[known], kind="stable")]
+    return values[order], order
+
+
+def build_filter_index(courses):
+    """
+    Builds the FilterIndex for a catalog frame. Row positions in the masks match
+    the positions in `courses`.
+    """
+    rating_sorted, rating_order = _sorted_with_order(courses["course_rating"])
+    duration_sorted, duration_order = _sorted_with_order(courses["course_duration"])
+    level_masks = {
+        level: courses["course_level"].str.contains(level, case=False, na=False).to_numpy(dtype=bool)
+        for level in COURSE_LEVELS[1:]
+    }
+    return FilterIndex(
+        size=len(courses),
+        is_free=(courses["price"] == "Free").to_numpy(dtype=bool),
+        level_masks=level_masks,
+        rating_sorted=rating_sorted,
+        rating_order=rating_order,
+        duration_sorted=duration_sorted,
+        duration_order=duration_order,
+    )
+
+
+def _at_least(sorted_values, order, threshold, size):
+    """
+    Boolean mask of the rows whose value is >= threshold.
+    """
+    mask = np.zeros(size, dtype=bool)
+    mask[order[np.searchsorted(sorted_values, threshold, side="left"):]] = True
+    return mask
+
+
+def filter_mask(index, course_type="All", course_level="All", min_rating=0.0, min_duration=0):
+    """
+    Returns a boolean mask over the catalog rows matching every sidebar filter.
+    "All" and zero thresholds disable the corresponding filter, exactly like the
+    sidebar defaults. Any combination costs a few vectorized ANDs.
+    """
+    if course_type not in COURSE_TYPES:
+        raise ValueError(f"Unknown course type: {course_type}")
+    if course_level not in COURSE_LEVELS:
+        raise ValueError(f"Unknown course level: {course_level}")
+
+    mask = np.ones(index.size, dtype=bool)
+
+    # Filter by course type
+    if course_type == "Free":
+        mask &= index.is_free
+    elif course_type == "Paid":
+        mask &= ~index.is_free
+
+    # Filter by course level
+    if course_level != "All":
+        mask &= index.level_masks[course_level]
+
+    # Filter by minimum rating
+    if min_rating > 0.0:
+        mask &= _at_least(index.rating_sorted, index.rating_order, min_rating, index.size)
+
+    # Filter by minimum duration
+    if min_duration > 0:
+        mask &= _at_least(index.duration_sorted, index.duration_order, min_duration, index.size)
+
+    return mask
@@ -1,5 +1,5 @@
-import streamlit as st
-import app  # Import the main app code from app.py
-
-if __name__ == "__main__":
-    app.main()  # Call the function to run the main app
+import streamlit as st
+import app  # Import the main app code from app.py
+
+if __name__ == "__main__":
+    app.main()  # Call the function to run the main app
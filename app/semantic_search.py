@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# The search engine lives in scripts/search_queries.py; make scripts/ importable
+# when the app is started with `streamlit run app/app.py`
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+
+# Number of recent queries used for the p50/p95 latency report
+LATENCY_WINDOW = 200
+
+# Process-wide searcher, created on the first semantic query
+_searcher = None
+_searcher_lock = threading.Lock()
+
+# Hybrid searcher for the current catalog version, as (version, HybridSearcher)
+_hybrid = None
+_hybrid_lock = threading.Lock()
+
+_latencies_ms = deque(maxlen=LATENCY_WINDOW)
+_latency_lock = threading.Lock()
+
+
+def get_searcher():
+    """
+    Returns the process-wide CourseSearcher. The model and index behind it load once.
+    The import is deferred so the app starts quickly when semantic search is unused.
+    """
+    global _searcher
+    if _searcher is None:
+        with _searcher_lock:
+            if _searcher is None:
+                from search_queries import CourseSearcher
+                _searcher = CourseSearcher()
+    return _searcher
+
+
+def get_hybrid_searcher(catalog):
+    """
+    Returns the HybridSearcher over `catalog`, sharing the process-wide semantic
+    searcher and the catalog's keyword index; it also serves filtered semantic
+    search. It is rebuilt when the catalog changes.
+    """
+    global _hybrid
+    hybrid = _hybrid
+    if hybrid is None or hybrid[0] != catalog.version:
+        with _hybrid_lock:
+            if _hybrid is None or _hybrid[0] != catalog.version:
+                from search_queries import HybridSearcher
+                _hybrid = (catalog.version, HybridSearcher(catalog.frame, get_searcher(), catalog.text_index))
+            hybrid = _hybrid
+    return hybrid[1]
+
+
+def _record_latency(elapsed_ms):
+    """
+    Adds a query latency to the recent window reported by latency_percentiles().
+    """
+    with _latency_lock:
+        _latencies_ms.append(elapsed_ms)
+
+
+def latency_percentiles():
+    """
+    Returns (p50, p95, count): the latency percentiles in milliseconds over the
+    recent window and the number of queries in it, or None if no query ran yet.
+    """
+    with _latency_lock:
+        if not _latencies_ms:
+            return None
+        p50, p95 = np.percentile(_latencies_ms, [50, 95])
+        count = len(_latencies_ms)
+    return p50, p95, count
+
+
+def semantic_search(query, catalog, mask=None, top_k=10):
+    """
+    Ranks the catalog rows allowed by `mask` (the sidebar filters) by semantic
+    similarity to `query`. The mask is applied inside the vector search, so a
+    filtered query still gets a full top_k. Returns the matching rows best-first
+    with a `score` column where higher is more similar: in (0, 1] for an L2
+    index, the cosine similarity for a cosine index.
+    """
+    start = time.perf_counter()
+    rows, scores = get_hybrid_searcher(catalog).semantic_search(query, top_k, allowed=mask)
+    results = catalog.courses.iloc[rows].assign(score=scores)
+    _record_latency((time.perf_counter() - start) * 1000)
+    return results
+
+
+def hybrid_search(query, catalog, mask=None, top_k=10):
+    """
+    Ranks the catalog rows allowed by `mask` (the sidebar filters) by keyword
+    and semantic relevance fused with reciprocal rank fusion. Returns the rows
+    best-first with a `score` column, and the per-stage timings in milliseconds.
+    """
+    rows, scores, timings = get_hybrid_searcher(catalog).search(query, top_k, allowed=mask)
+    _record_latency(timings['total_ms'])
+    return catalog.courses.iloc[rows].assign(score=scores), timings
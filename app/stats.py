@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Bins of the rating histogram on the visualizations page
+RATING_BINS = 10
+
+# Featured courses: the first courses rated at least this high
+FEATURED_MIN_RATING = 4.5
+FEATURED_COUNT = 3
+
+
+@dataclass(frozen=True)
+class CatalogStats:
+    """
+    Aggregates shown by the sidebar and the visualizations page.
+    Level counts map every category of `course_level` to its number of
+    courses. The rating histogram is stored as bin counts and edges, the rating
+    distribution as distinct ratings and their counts, and the featured
+    courses as row positions in the catalog frame.
+    """
+    total: int
+    average_rating: float
+    free_count: int
+    paid_count: int
+    level_counts: dict
+    rating_histogram: tuple
+    rating_counts: tuple
+    featured_rows: np.ndarray
+
+
+def build_catalog_stats(courses):
+    """
+    Computes the CatalogStats of a catalog frame in one pass over each column.
+    """
+    ratings = courses["course_rating"].to_numpy(dtype="float64", na_value=np.nan)
+    known_ratings = ratings[~np.isnan(ratings)]
+    is_free = (courses["price"] == "Free").to_numpy(dtype=bool)
+    free_count = int(is_free.sum())
+
+    level_counts = {
+        str(level): int(count) for level, count in courses["course_level"].value_counts(sort=False).items()
+    }
+    distinct, counts = np.unique(known_ratings, return_counts=True)
+    if len(known_ratings):
+        histogram = np.histogram(known_ratings, bins=RATING_BINS)
+    else:
+        histogram = (np.zeros(0, dtype="int64"), np.zeros(0))
+
+    return CatalogStats(
+        total=len(courses),
+        average_rating=float(known_ratings.mean()) if len(known_ratings) else float("nan"),
+        free_count=free_count,
+        paid_count=len(courses) - free_count,
+        level_counts=level_counts,
+        rating_histogram=histogram,
+        rating_counts=(distinct, counts),
+        featured_rows=np.flatnonzero(ratings >= FEATURED_MIN_RATING)[:FEATURED_COUNT],
+    )
@@ -0,0 +1,222 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Fields indexed for keyword search and how much a term occurrence in each counts
+FIELD_WEIGHTS = {
+    "course_title": 3.0,
+    "course_description": 1.0,
+    "course_curriculum": 0.5,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# The last query word is treated as a prefix; cap how many terms it may expand to
+MAX_EXPANSIONS = 50
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Bytes that can be part of a term, as a lookup table over byte values
+TERM_BYTES = np.zeros(256, dtype=bool)
+TERM_BYTES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", dtype="uint8")] = True
+
+# Documents tokenized at a time while building the index
+BUILD_CHUNK_SIZE = 20000
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase alphanumeric terms.
+    """
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TextIndex:
+    """
+    Inverted index with BM25 ranking over the catalog text fields.
+    Terms are numbered in sorted order and postings are stored in CSR layout
+    (offsets, doc ids, weights), with the full BM25 weight of every posting
+    precomputed. Because the vocabulary is sorted, all terms sharing a prefix
+    form one contiguous id range found by binary search, which is what lets the
+    last query word match as a prefix (autocomplete) without scanning the vocabulary.
+    """
+
+    def __init__(self, terms, offsets, doc_ids, weights, size):
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.size = size
+        self._term_ids = {term: i for i, term in enumerate(terms)}
+
+    def _postings(self, term_id):
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+
+    def prefix_range(self, prefix):
+        """
+        Returns the [lo, hi) range of term ids starting with `prefix`.
+        """
+        lo = bisect_left(self.terms, prefix)
+        hi = bisect_left(self.terms, prefix + "\uffff", lo)
+        return lo, hi
+
+    def expand_prefix(self, prefix, max_expansions=MAX_EXPANSIONS):
+        """
+        Term ids completing `prefix`, keeping the most frequent ones if there are too many.
+        """
+        lo, hi = self.prefix_range(prefix)
+        term_ids = np.arange(lo, hi)
+        if len(term_ids) > max_expansions:
+            doc_freqs = self.offsets[lo + 1:hi + 1] - self.offsets[lo:hi]
+            term_ids = term_ids[np.argpartition(-doc_freqs, max_expansions)[:max_expansions]]
+        return term_ids
+
+    def search(self, query, top_k=None, allowed=None, match_all=True):
+        """
+        Returns (doc_ids, scores) of documents containing every query word, best first.
+        The last word also matches any term it is a prefix of. `allowed` is an
+        optional boolean mask restricting the candidate documents. With
+        `match_all=False` documents containing any of the words match (classic
+        BM25 retrieval, used as the keyword stage of hybrid search).
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        empty = (np.zeros(0, dtype="int64"), np.zeros(0, dtype="float64"))
+        if not words:
+            return empty
+
+        scores = np.zeros(self.size, dtype="float64")
+        matched = np.ones(self.size, dtype=bool) if allowed is None else allowed.copy()
+        matched_any = np.zeros(self.size, dtype=bool)
+
+        *complete_words, last_word = words
+        groups = []
+        for word in complete_words:
+            term_id = self._term_ids.get(word)
+            if term_id is None:
+                if match_all:
+                    return empty
+                continue
+            groups.append([term_id])
+        groups.append(self.expand_prefix(last_word))
+
+        for term_ids in groups:
+            hit = np.zeros(self.size, dtype=bool)
+            for term_id in term_ids:
+                docs, weights = self._postings(term_id)
+                hit[docs] = True
+                scores[docs] += weights
+            if match_all:
+                matched &= hit
+            else:
+                matched_any |= hit
+        if not match_all:
+            matched &= matched_any
+
+        candidates = np.flatnonzero(matched)
+        candidate_scores = scores[candidates]
+        if top_k is not None and len(candidates) > top_k:
+            best = np.argpartition(-candidate_scores, top_k)[:top_k]
+            candidates, candidate_scores = candidates[best], candidate_scores[best]
+        order = np.lexsort((candidates, -candidate_scores))  # Ties keep catalog order
+        return candidates[order], candidate_scores[order]
+
+
+def _tokenize_column(values):
+    """
+    Tokenizes a text column like tokenize(), on the column's UTF-8 bytes instead
+    of one Python call per value: after lowercasing, terms are the runs of ASCII
+    letters and digits, and any other byte (including every byte of a non-ASCII
+    character) separates them. Returns (tokens, row positions), one entry per
+    token occurrence; missing values have no tokens.
+    """
+    text = pc.utf8_lower(pa.array(values, type=pa.large_string(), from_pandas=True).fill_null(""))
+    _, value_offsets, data = text.buffers()
+    value_offsets = np.frombuffer(value_offsets, dtype="int64")[text.offset:text.offset + len(text) + 1]
+    data = np.frombuffer(data, dtype="uint8") if data is not None else np.zeros(0, dtype="uint8")
+    data, value_offsets = data[value_offsets[0]:value_offsets[-1]], value_offsets - value_offsets[0]
+
+    # A term starts at a term byte that follows a separator or begins a value
+    in_term = TERM_BYTES[data]
+    starts = in_term.copy()
+    starts[1:] &= ~in_term[:-1]
+    value_starts = value_offsets[:-1][value_offsets[:-1] < len(data)]
+    starts[value_starts] = in_term[value_starts]
+
+    # Dropping the separator bytes leaves the terms back to back, which is the
+    # layout of an Arrow string array
+    term_bytes = data[in_term]
+    term_offsets = np.append(np.flatnonzero(starts[in_term]), len(term_bytes)).astype("int64")
+    tokens = pa.LargeStringArray.from_buffers(len(term_offsets) - 1, pa.py_buffer(term_offsets), pa.py_buffer(term_bytes))
+    rows = np.searchsorted(value_offsets, np.flatnonzero(starts), side="right") - 1
+    return tokens, rows
+
+
+def build_text_index(courses, field_weights=FIELD_WEIGHTS, k1=K1, b=B, chunk_size=BUILD_CHUNK_SIZE):
+    """
+    Builds a TextIndex over `courses`. Document ids are row positions in the frame.
+    Field occurrences are weighted before BM25 saturation (BM25F-style).
+    Documents are tokenized `chunk_size` at a time and reduced to (term, document,
+    frequency) postings right away, so peak memory follows the postings rather
+    than the raw token stream.
+    """
+    size = len(courses)
+    doc_lengths = np.zeros(size, dtype="float64")
+    chunks = []
+    for first in range(0, size, chunk_size):
+        chunk = courses.iloc[first:first + chunk_size]
+        tokens, rows, weights = [], [], []
+        for field, weight in field_weights.items():
+            field_tokens, field_rows = _tokenize_column(chunk[field])
+            tokens.append(field_tokens)
+            rows.append(field_rows)
+            weights.append(np.full(len(field_rows), weight))
+        tokens = pa.chunked_array(tokens, type=pa.large_string())
+        rows, weights = np.concatenate(rows), np.concatenate(weights)
+        doc_lengths[first:first + len(chunk)] = np.bincount(rows, weights=weights, minlength=len(chunk))
+
+        # Sum the weighted occurrences of each (term, document) pair of the chunk.
+        # The chunk vocabulary is sorted, so pairs come out ordered by term as
+        # numbered across all chunks, then by document
+        vocabulary = pc.unique(tokens).sort()
+        term_ids = pc.index_in(tokens, value_set=vocabulary).to_numpy()
+        pairs, pair_ids = np.unique(term_ids * len(chunk) + rows, return_inverse=True)
+        chunks.append((vocabulary, pairs // len(chunk), pairs % len(chunk) + first,
+                       np.bincount(pair_ids, weights=weights)))
+
+    # Number the terms in sorted order across chunks; tokens are ASCII, so Arrow's
+    # byte order matches Python string order
+    vocabularies = pa.chunked_array([chunk[0] for chunk in chunks], type=pa.large_string())
+    vocabulary = pc.unique(vocabularies).sort() if size else pa.array([], type=pa.large_string())
+    term_ids = np.concatenate([pc.index_in(chunk[0], value_set=vocabulary).to_numpy()[chunk[1]] for chunk in chunks] or [np.zeros(0, dtype="int64")])
+    doc_ids = np.concatenate([chunk[2] for chunk in chunks] or [np.zeros(0, dtype="int64")])
+    term_freqs = np.concatenate([chunk[3] for chunk in chunks] or [np.zeros(0, dtype="float64")])
+
+    # CSR layout: postings grouped by term, documents ascending within a term.
+    # Each chunk is already in that order and chunks follow document order, so a
+    # stable sort on the term only merges the presorted chunk runs
+    order = np.argsort(term_ids, kind="stable")
+    term_ids, doc_ids, term_freqs = term_ids[order], doc_ids[order], term_freqs[order]
+    doc_freqs = np.bincount(term_ids, minlength=len(vocabulary))
+    offsets = np.zeros(len(vocabulary) + 1, dtype="int64")
+    np.cumsum(doc_freqs, out=offsets[1:])
+
+    avg_length = (doc_lengths.mean() if size else 0.0) or 1.0
+    idf = np.log(1 + (size - doc_freqs + 0.5) / (doc_freqs + 0.5))
+    norms = k1 * (1 - b + b * doc_lengths[doc_ids] / avg_length)
+    posting_weights = idf[term_ids] * term_freqs * (k1 + 1) / (term_freqs + norms)
+
+    return TextIndex(
+        vocabulary.to_pylist(),
+        offsets,
+        doc_ids.astype("int64"),
+        posting_weights,
+        size,
+    )
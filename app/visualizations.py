@@ -1,51 +1,105 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-
-def show():
-    st.title("Visualizations")
-    st.write("Explore various insights about the courses.")
-
-    # Load the data
-    data_path = "data/courses_data_final.csv"
-    df_courses = pd.read_csv(data_path, encoding='ISO-8859-1')  # Adjust encoding if necessary
-
-    # Course Rating Distribution Visualization
-    st.subheader("Course Rating Distribution")
-    fig, ax = plt.subplots()
-    df_courses['course_rating'].hist(bins=10, ax=ax, color='skyblue')
-    ax.set_xlabel("Rating")
-    ax.set_ylabel("Number of Courses")
-    ax.set_title("Distribution of Ratings")
-    st.pyplot(fig)
-
-    # Bar chart for ratings distribution
-    ratings_dist = df_courses['course_rating'].value_counts().sort_index()
-    fig, ax = plt.subplots()
-    ax.bar(ratings_dist.index, ratings_dist.values, color='skyblue')
-    ax.set_title("Ratings Distribution")
-    ax.set_xlabel("Rating")
-    ax.set_ylabel("Number of Courses")
-    st.pyplot(fig)
-
-    # Featured Courses: Top courses with rating 4.5 or higher
-    st.markdown("### Featured Courses")
-    top_courses = df_courses[df_courses['course_rating'] >= 4.5].head(3)
-    for index, course in top_courses.iterrows():
-        st.markdown(f"**{course['course_title']}** - {course['course_rating']} ⭐")
-        st.write(f"Price: {course['price']}")
-        st.write(f"[Access Course]({course['course_url']})")
-
-    # Course Comparison Feature
-    selected_courses = st.multiselect(
-        "Select courses to compare", df_courses['course_title'].tolist()
-    )
-
-    if len(selected_courses) > 1:
-        comparison_df = df_courses[df_courses['course_title'].isin(selected_courses)]
-        st.markdown("### Comparison of Selected Courses")
-        for index, course in comparison_df.iterrows():
-            st.markdown(f"**{course['course_title']}** - {course['course_rating']} ⭐")
-            st.write(f"Price: {course['price']}")
-            st.write(f"Level: {course['course_level']}")
-            st.write(f"[Access Course]({course['course_url']})")
+import io
+import threading
+
+import streamlit as st
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from catalog import load_catalog
+
+# Rendered figures as PNG bytes, keyed by (catalog version, figure name)
+_figures = {}
+_figures_lock = threading.Lock()
+
+
+def _render_png(draw):
+    """
+    Draws a figure with `draw(ax)` and returns it as PNG bytes.
+    """
+    fig, ax = plt.subplots()
+    draw(ax)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _figure_png(catalog, name, draw):
+    """
+    Returns the cached PNG of figure `name` for this catalog version, drawing
+    it on first use. Figures of older catalog versions are dropped.
+    """
+    key = (catalog.version, name)
+    png = _figures.get(key)
+    if png is None:
+        with _figures_lock:
+            png = _figures.get(key)
+            if png is None:
+                for stale in [k for k in _figures if k[0] != catalog.version]:
+                    del _figures[stale]
+                png = _render_png(draw)
+                _figures[key] = png
+    return png
+
+
+def _draw_rating_histogram(stats):
+    counts, edges = stats.rating_histogram
+
+    def draw(ax):
+        ax.hist(edges[:-1], bins=edges, weights=counts, color='skyblue')
+        ax.grid(True)
+        ax.set_xlabel("Rating")
+        ax.set_ylabel("Number of Courses")
+        ax.set_title("Distribution of Ratings")
+    return draw
+
+
+def _draw_rating_counts(stats):
+    ratings, counts = stats.rating_counts
+
+    def draw(ax):
+        ax.bar(ratings, counts, color='skyblue')
+        ax.set_title("Ratings Distribution")
+        ax.set_xlabel("Rating")
+        ax.set_ylabel("Number of Courses")
+    return draw
+
+
+def show():
+    st.title("Visualizations")
+    st.write("Explore various insights about the courses.")
+
+    # Load the data; aggregates and figures are computed once per catalog version
+    data_path = "data/courses_data_final.parquet"
+    catalog = load_catalog(data_path)
+    df_courses = catalog.courses
+    stats = catalog.stats
+
+    # Course Rating Distribution Visualization
+    st.subheader("Course Rating Distribution")
+    st.image(_figure_png(catalog, "rating_histogram", _draw_rating_histogram(stats)))
+
+    # Bar chart for ratings distribution
+    st.image(_figure_png(catalog, "rating_counts", _draw_rating_counts(stats)))
+
+    # Featured Courses: Top courses with rating 4.5 or higher
+    st.markdown("### Featured Courses")
+    top_courses = df_courses.iloc[stats.featured_rows]
+    for index, course in top_courses.iterrows():
+        st.markdown(f"**{course['course_title']}** - {course['course_rating']} ⭐")
+        st.write(f"Price: {course['price']}")
+        st.write(f"[Access Course]({course['course_url']})")
+
+    # Course Comparison Feature
+    selected_courses = st.multiselect(
+        "Select courses to compare", df_courses['course_title'].tolist()
+    )
+
+    if len(selected_courses) > 1:
+        comparison_df = df_courses[df_courses['course_title'].isin(selected_courses)]
+        st.markdown("### Comparison of Selected Courses")
+        for index, course in comparison_df.iterrows():
+            st.markdown(f"**{course['course_title']}** - {course['course_rating']} ⭐")
+            st.write(f"Price: {course['price']}")
+            st.write(f"Level: {course['course_level']}")
+            st.write(f"[Access Course]({course['course_url']})")
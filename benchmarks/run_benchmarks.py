@@ -0,0 +1,267 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import psutil
+
+from synthetic_catalog import DATA_PATH, ROOT_DIR, SIZES, ensure_synthetic_catalog
+
+# The app and the search scripts are benchmarked in-process; make both importable
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+import catalog as catalog_module
+from cards import page_count, render_page
+from filters import COURSE_LEVELS, COURSE_TYPES, filter_mask
+
+STAGES = ['load', 'filters', 'suggestions', 'render', 'faiss', 'embeddings']
+
+# Slider positions benchmarked for the Home page's rating and duration filters;
+# combined with every course type and level option they cover each filter path
+RATING_THRESHOLDS = [0.0, 2.5, 4.0, 4.5, 5.0]
+DURATION_THRESHOLDS = [0, 30, 120, 600, 3300]
+
+# What a user types into the search box, keystroke by keystroke
+SUGGESTION_QUERIES = ["p", "py", "pyth", "python", "data", "data sc", "machine lea", "deep learning",
+                      "gen", "generative ai", "nlp", "llm", "sql for", "computer vision", "prompt eng"]
+
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+REGRESSION_TOLERANCE = 0.25  # A metric 25% worse than the baseline is a regression
+NOISE_FLOOR_MS = 0.1  # Timings closer than this to the baseline are timer jitter, not regressions
+
+
+def percentiles(values_ms):
+    p50, p95 = np.percentile(values_ms, [50, 95])
+    return {'p50_ms': float(p50), 'p95_ms': float(p95), 'max_ms': float(np.max(values_ms))}
+
+
+def timed_ms(function, *args, **kwargs):
+    """Runs `function` once; returns (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def bench_load(path, catalog, args):
+    """Cold catalog load (read and parse) and a warm cache hit."""
+    catalog_module.cache_clear()
+    loaded, cold_ms = timed_ms(catalog_module.load_catalog, path)
+    _, warm_ms = timed_ms(catalog_module.load_catalog, path)
+    return {
+        'cold_ms': cold_ms,
+        'warm_ms': warm_ms,
+        'file_mb': os.path.getsize(path) / (1024 ** 2),
+        'memory_mb': float(loaded.frame.memory_usage(deep=True).sum()) / (1024 ** 2),
+    }
+
+
+def bench_filters(path, catalog, args):
+    """Every sidebar filter combination of the Home page, including the mask-to-rows step."""
+    _, build_ms = timed_ms(lambda: catalog.filter_index)
+    timings, slowest = [], None
+    for combination in itertools.product(COURSE_TYPES, COURSE_LEVELS, RATING_THRESHOLDS, DURATION_THRESHOLDS):
+        best = min(timed_ms(lambda: np.flatnonzero(filter_mask(catalog.filter_index, *combination)))[1]
+                   for _ in range(args.repeats))
+        timings.append(best)
+        if slowest is None or best > slowest[1]:
+            slowest = (combination, best)
+    return {'index_build_ms': build_ms, 'combinations': len(timings), **percentiles(timings),
+            'slowest_combination': list(slowest[0])}
+
+
+def bench_suggestions(path, catalog, args):
+    """Title suggestions as the app shows them: top 5 BM25 matches, prefix-expanding the last word."""
+    _, build_ms = timed_ms(lambda: catalog.text_index)
+    titles = catalog.frame['course_title']
+    timings = []
+    for query in SUGGESTION_QUERIES:
+        for _ in range(args.repeats):
+            timings.append(timed_ms(lambda: titles.iloc[catalog.text_index.search(query, top_k=5)[0]].tolist())[1])
+    return {'index_build_ms': build_ms, 'queries': len(SUGGESTION_QUERIES), **percentiles(timings)}
+
+
+def bench_render(path, catalog, args):
+    """Result card cache build and rendering one page of an unfiltered result list."""
+    _, build_ms = timed_ms(lambda: catalog.cards)
+    rows = np.arange(len(catalog))
+    timings = [timed_ms(render_page, catalog.cards, rows, page)[1]
+               for page in (1, page_count(len(rows))) for _ in range(args.repeats)]
+    return {'cards_build_ms': build_ms, **percentiles(timings)}
+
+
+def bench_faiss(path, catalog, args):
+    """Index build, single-query latency and batch throughput over jittered real embeddings."""
+    from benchmark_index import load_vectors, make_queries
+    from generate_embeddings import create_faiss_index
+
+    vectors = load_vectors(args.embeddings_path, synthetic_size=len(catalog))[:len(catalog)]
+    queries = make_queries(vectors, args.num_queries)
+    index, build_ms = timed_ms(create_faiss_index, vectors, None, args.index_type)
+    top_k = min(10, len(vectors))
+    timings = [timed_ms(index.search, queries[i:i + 1], top_k)[1] for i in range(len(queries))]
+    _, batch_ms = timed_ms(index.search, queries, top_k)
+    return {'index_type': args.index_type, 'build_ms': build_ms, **percentiles(timings),
+            'batch_queries_per_sec': len(queries) / (batch_ms / 1000)}
+
+
+def bench_embeddings(path, catalog, args):
+    """Passage embedding throughput on a sample of the catalog, batched as generate_embeddings.py does."""
+    from generate_embeddings import CHARS_PER_TOKEN, CHUNK_TOKENS, build_passages, generate_embeddings
+    from search_queries import MODEL_NAME, get_model
+
+    model = get_model(MODEL_NAME)
+    sample = catalog.frame.iloc[:min(len(catalog), args.embed_sample)]
+    _, _, texts = build_passages(sample, CHUNK_TOKENS * CHARS_PER_TOKEN)
+    _, encode_ms = timed_ms(generate_embeddings, texts, model, 'auto')
+    return {'courses': len(sample), 'passages': len(texts), 'encode_ms': encode_ms,
+            'passages_per_sec': len(texts) / (encode_ms / 1000)}
+
+
+BENCHMARKS = {
+    'load': bench_load,
+    'filters': bench_filters,
+    'suggestions': bench_suggestions,
+    'render': bench_render,
+    'faiss': bench_faiss,
+    'embeddings': bench_embeddings,
+}
+
+
+def run_size(size, args):
+    """Runs the selected stages on the synthetic catalog of `size` courses."""
+    path = ensure_synthetic_catalog(size, args.source_path, args.seed)
+    catalog_module.cache_clear()
+    catalog = catalog_module.load_catalog(path)
+    results = {}
+    for stage in args.stages:
+        logging.info(f"{size} courses: {stage}...")
+        results[stage] = BENCHMARKS[stage](path, catalog, args)
+    # Footprint with the catalog and everything the stages built still loaded
+    results['process'] = {'rss_mb': psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2)}
+    catalog_module.cache_clear()
+    return results
+
+
+def flatten(results):
+    """{'10000': {'filters': {'p95_ms': ...}}} -> {'10000.filters.p95_ms': ...} for the numeric metrics."""
+    return {
+        f"{size}.{stage}.{name}": value
+        for size, stages in results.items()
+        for stage, metrics in stages.items()
+        for name, value in metrics.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+def lower_is_better(metric):
+    """Times and sizes should go down, rates up; other metrics (counts) are not compared."""
+    if metric.endswith(('_ms', '_mb')):
+        return True
+    if metric.endswith('_per_sec'):
+        return False
+    return None
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """
+    Compares every shared metric with the baseline. `change` is the relative
+    change in the metric's own direction (positive = better), and a metric
+    worse than `tolerance` is a regression, unless it is a timing within
+    NOISE_FLOOR_MS of the baseline.
+    """
+    current, previous = flatten(results), flatten(baseline['results'])
+    comparison = []
+    for metric in sorted(current.keys() & previous.keys()):
+        direction = lower_is_better(metric)
+        if direction is None or not previous[metric]:
+            continue
+        ratio = current[metric] / previous[metric]
+        change = (1 - ratio) if direction else (ratio - 1)
+        jitter = metric.endswith('_ms') and abs(current[metric] - previous[metric]) < NOISE_FLOOR_MS
+        comparison.append({'metric': metric, 'baseline': previous[metric], 'current': current[metric],
+                           'change': float(change), 'regression': bool(change < -tolerance and not jitter)})
+    return comparison
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'memory_gb': psutil.virtual_memory().total / (1024 ** 3),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(args):
+    results = {str(size): run_size(size, args) for size in args.sizes}
+    # The largest size that ran on this machine; what the baseline covers
+    report = {'environment': environment(), 'stages': args.stages, 'max_size': max(args.sizes), 'results': results}
+
+    # Display the results
+    header = f"{'size':>9} {'stage':<12} {'metric':<22} {'value':>12}"
+    print(header)
+    print('-' * len(header))
+    for metric, value in flatten(results).items():
+        size, stage, name = metric.split('.', 2)
+        print(f"{size:>9} {stage:<12} {name:<22} {value:>12.3f}")
+
+    # Compare against the stored baseline
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['comparison'] = compare(results, baseline, args.tolerance)
+        regressions = [entry for entry in report['comparison'] if entry['regression']]
+        print(f"\nCompared with {args.baseline} ({baseline['environment']['timestamp']}, "
+              f"up to {baseline.get('max_size', 'unknown')} courses):")
+        header = f"{'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}"
+        print(header)
+        print('-' * len(header))
+        for entry in report['comparison']:
+            flag = "  REGRESSION" if entry['regression'] else ""
+            print(f"{entry['metric']:<40} {entry['baseline']:>12.3f} {entry['current']:>12.3f} "
+                  f"{entry['change']:>+7.0%}{flag}")
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+    elif args.baseline and not args.save_baseline:
+        logging.info(f"No baseline at {args.baseline}; run with --save_baseline to store one.")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Results saved at: {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Baseline saved at: {args.baseline}")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Benchmark catalog load, filters, suggestions, rendering, FAISS search "
+                                                 "and embedding throughput on synthetic catalogs.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES, help="Synthetic catalog sizes (courses).")
+    parser.add_argument("--stages", type=str, nargs='+', default=STAGES, choices=STAGES, help="Stages to benchmark.")
+    parser.add_argument("--source_path", type=str, default=DATA_PATH, help="Real catalog the synthetic ones are sampled from.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic catalogs.")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetitions per timed operation.")
+    parser.add_argument("--embeddings_path", type=str, default="vector_store/course_embeddings.npy", help="Real embeddings jittered into the FAISS corpus.")
+    parser.add_argument("--index_type", type=str, default='flat', help="FAISS index type to benchmark.")
+    parser.add_argument("--num_queries", type=int, default=100, help="FAISS queries per catalog size.")
+    parser.add_argument("--embed_sample", type=int, default=500, help="Courses embedded to measure embedding throughput.")
+    parser.add_argument("--output", type=str, default=None, help="Optional path to save the results as JSON.")
+    parser.add_argument("--baseline", type=str, default=BASELINE_PATH, help="Baseline results to compare against.")
+    parser.add_argument("--save_baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="Relative slowdown reported as a regression.")
+    parser.add_argument("--fail_on_regression", action="store_true", help="Exit with status 1 when a metric regressed.")
+    args = parser.parse_args()
+
+    sys.exit(main(args))
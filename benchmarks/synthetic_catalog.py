@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# The catalog schema lives in app/catalog.py; make app/ importable
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+from catalog import DATA_PATH, read_catalog, write_catalog
+from text_index import tokenize
+
+# Catalog sizes benchmarked by default. 100k courses is the largest that fits a
+# 5 GB machine (about 2.2 GB peak); larger sizes can still be passed explicitly
+SIZES = [100, 10_000, 100_000]
+
+# Generated catalogs are kept here and reused across runs
+SYNTHETIC_DIR = os.path.join(ROOT_DIR, "benchmarks", "data")
+
+
+def synthetic_catalog(courses, size, seed=0):
+    """
+    Builds a catalog of `size` courses with the schema and dtypes of `courses`.
+    Rows are sampled from the real catalog, so text lengths, prices, levels and
+    ratings (including missing ones) follow the real distributions. Titles gain
+    a word drawn from the real title vocabulary so keyword search sees more
+    distinct documents, URLs are made unique, and durations are spread by a
+    random factor so duration thresholds select varied subsets.
+    """
+    rng = np.random.default_rng(seed)
+    synthetic = courses.iloc[rng.integers(0, len(courses), size=size)].reset_index(drop=True)
+
+    vocabulary = np.array(sorted({term for title in courses['course_title'] for term in tokenize(title)}))
+    numbers = pd.Series(np.arange(size)).astype(str)
+    synthetic['course_title'] = synthetic['course_title'] + ' ' + pd.Series(rng.choice(vocabulary, size=size)).str.title()
+    synthetic['course_url'] = synthetic['course_url'] + '-' + numbers
+    durations = synthetic['course_duration'].to_numpy() * rng.uniform(0.5, 2.0, size=size)
+    synthetic['course_duration'] = durations.round().astype(courses['course_duration'].dtype)
+    return synthetic
+
+
+def synthetic_catalog_path(size, seed=0, directory=SYNTHETIC_DIR):
+    return os.path.join(directory, f"catalog_{size}_seed{seed}.parquet")
+
+
+def ensure_synthetic_catalog(size, source_path=DATA_PATH, seed=0, directory=SYNTHETIC_DIR):
+    """
+    Returns the path of the synthetic catalog of `size` courses, generating
+    and writing it from the real catalog at `source_path` on first use.
+    """
+    path = synthetic_catalog_path(size, seed, directory)
+    if not os.path.exists(path):
+        write_catalog(synthetic_catalog(read_catalog(source_path), size, seed), path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic course catalogs from the real catalog schema.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES, help="Number of courses in each catalog.")
+    parser.add_argument("--source_path", type=str, default=DATA_PATH, help="Real catalog the rows are sampled from.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--output_dir", type=str, default=SYNTHETIC_DIR, help="Directory to write the catalogs to.")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        path = ensure_synthetic_catalog(size, args.source_path, args.seed, args.output_dir)
+        print(f"{size} courses: {path} ({os.path.getsize(path) / (1024 ** 2):.1f} MB)")
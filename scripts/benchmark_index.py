@@ -0,0 +1,154 @@
+import argparse
+import itertools
+import json
+import logging
+import time
+
+import faiss
+import numpy as np
+
+from generate_embeddings import (DEFAULT_INDEX_PARAMS, INDEX_TYPES, METRICS, STORAGE_TYPES, create_faiss_index,
+                                  load_embeddings, to_storage)
+
+# Parameters that affect each index type; the benchmark sweeps over these only
+RELEVANT_PARAMS = {
+    'flat': [],
+    'hnsw': ['hnsw_m', 'ef_construction', 'ef_search'],
+    'ivf': ['nlist', 'nprobe'],
+    'ivfpq': ['nlist', 'nprobe', 'pq_m', 'pq_bits'],
+}
+
+def load_vectors(embeddings_path, synthetic_size=None, seed=0):
+    """
+    Loads the course embeddings. With `synthetic_size`, the corpus is grown to that
+    many vectors by jittering real embeddings, to estimate behaviour on a larger catalog.
+    """
+    vectors = load_embeddings(embeddings_path)
+    if synthetic_size and synthetic_size > len(vectors):
+        rng = np.random.default_rng(seed)
+        picks = rng.integers(0, len(vectors), size=synthetic_size - len(vectors))
+        noise = rng.normal(0, 0.1 * vectors.std(), size=(len(picks), vectors.shape[1])).astype('float32')
+        vectors = np.vstack([vectors, vectors[picks] + noise])
+    logging.info(f"Benchmarking on {len(vectors)} vectors of dimension {vectors.shape[1]}.")
+    return vectors
+
+def make_queries(vectors, num_queries, seed=1):
+    """Queries are perturbed corpus vectors, so they are realistic but never exact duplicates."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(vectors), size=num_queries)
+    noise = rng.normal(0, 0.05 * vectors.std(), size=(num_queries, vectors.shape[1])).astype('float32')
+    return vectors[picks] + noise
+
+def index_memory_bytes(index):
+    """Size of the serialized index, a close proxy for its in-memory footprint."""
+    return int(faiss.serialize_index(index).nbytes)
+
+def benchmark_index(vectors, queries, ground_truth, top_k, index_type, metric='l2', storage='float32', **index_params):
+    """
+    Builds one index configuration and measures build time, memory, single-query
+    latency (p50/p95), batch throughput and recall@k against the exact results.
+    The ground truth is always exact float32 L2 search, so recall also shows how
+    much the metric and storage change the ranking. Vectors are normalized for cosine.
+    """
+    if metric == 'cosine':
+        vectors, queries = vectors.copy(), queries.copy()
+        faiss.normalize_L2(vectors)
+        faiss.normalize_L2(queries)
+
+    start = time.perf_counter()
+    index = create_faiss_index(vectors, None, index_type, metric, storage, **index_params)
+    build_seconds = time.perf_counter() - start
+
+    latencies_ms = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query[None, :], top_k)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    _, found = index.search(queries, top_k)
+    batch_seconds = time.perf_counter() - start
+
+    recall = np.mean([
+        len(np.intersect1d(found_row, truth_row)) / top_k
+        for found_row, truth_row in zip(found, ground_truth)
+    ])
+    p50, p95 = np.percentile(latencies_ms, [50, 95])
+    return {
+        'index_type': index_type,
+        'metric': metric,
+        'storage': storage,
+        'params': index_params,
+        'build_seconds': round(build_seconds, 4),
+        'memory_mb': round(index_memory_bytes(index) / (1024 ** 2), 3),
+        'embeddings_mb': round(to_storage(vectors, storage).nbytes / (1024 ** 2), 3),
+        'latency_p50_ms': round(float(p50), 4),
+        'latency_p95_ms': round(float(p95), 4),
+        'batch_qps': round(len(queries) / batch_seconds, 1),
+        f'recall_at_{top_k}': round(float(recall), 4),
+    }
+
+def configurations(index_types, param_values, metrics=('l2',), storages=('float32',)):
+    """
+    Yields (index_type, metric, storage, params) for every combination of the swept
+    values. int8 storage needs cosine, and IVF-PQ has its own compression, so
+    combinations that would not be built are skipped.
+    """
+    for index_type in index_types:
+        names = RELEVANT_PARAMS[index_type]
+        for metric, storage in itertools.product(metrics, storages):
+            if (storage == 'int8' and metric != 'cosine') or (index_type == 'ivfpq' and storage != 'float32'):
+                continue
+            for values in itertools.product(*(param_values[name] for name in names)):
+                yield index_type, metric, storage, dict(zip(names, values))
+
+def main(args):
+    vectors = load_vectors(args.embeddings_path, args.synthetic_size)
+    queries = make_queries(vectors, args.num_queries)
+    top_k = min(args.top_k, len(vectors))
+
+    # Exact results from a brute-force scan are the recall baseline
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, ground_truth = exact.search(queries, top_k)
+
+    param_values = {name: getattr(args, name) for name in DEFAULT_INDEX_PARAMS}
+    results = [
+        benchmark_index(vectors, queries, ground_truth, top_k, index_type, metric, storage, **params)
+        for index_type, metric, storage, params in configurations(args.index_types, param_values, args.metrics, args.storages)
+    ]
+
+    # Display the results
+    header = (f"{'index':<8} {'metric':<7} {'storage':<8} {'params':<48} {'build s':>9} {'MB':>9} {'emb MB':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'QPS':>10} {'recall':>7}")
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        params = ', '.join(f"{name}={value}" for name, value in result['params'].items())
+        print(f"{result['index_type']:<8} {result['metric']:<7} {result['storage']:<8} {params:<48} "
+              f"{result['build_seconds']:>9.3f} {result['memory_mb']:>9.2f} {result['embeddings_mb']:>9.2f} "
+              f"{result['latency_p50_ms']:>8.3f} {result['latency_p95_ms']:>8.3f} {result['batch_qps']:>10.0f} "
+              f"{result[f'recall_at_{top_k}']:>7.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'num_vectors': len(vectors), 'num_queries': len(queries), 'top_k': top_k,
+                       'results': results}, f, indent=2)
+        logging.info(f"Results saved at: {args.output}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Compare FAISS index types on build time, memory, latency and recall@k.")
+    parser.add_argument("--embeddings_path", type=str, default="vector_store/course_embeddings.npy", help="Path to the embeddings file.")
+    parser.add_argument("--index_types", type=str, nargs='+', default=INDEX_TYPES, choices=INDEX_TYPES, help="Index types to benchmark.")
+    parser.add_argument("--metrics", type=str, nargs='+', default=['l2'], choices=METRICS, help="Similarity metrics to benchmark.")
+    parser.add_argument("--storages", type=str, nargs='+', default=['float32'], choices=STORAGE_TYPES, help="Vector storage types to benchmark.")
+    parser.add_argument("--synthetic_size", type=int, default=None, help="Grow the corpus to this many jittered vectors.")
+    parser.add_argument("--num_queries", type=int, default=200, help="Number of benchmark queries.")
+    parser.add_argument("--top_k", type=int, default=10, help="k for recall@k.")
+    parser.add_argument("--output", type=str, default=None, help="Optional path to save the results as JSON.")
+    for name, default in DEFAULT_INDEX_PARAMS.items():
+        parser.add_argument(f"--{name}", type=int, nargs='+', default=[default], help=f"Value(s) of {name} to sweep.")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,85 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from scrape_courses import PAGE_CACHE_DIR, PARSERS, parse_course_html
+
+def load_html_pages(html_dir):
+    """
+    Loads saved course detail pages: the bodies in a scraper page cache (listing
+    pages are skipped) and any *.html files in `html_dir`.
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(html_dir, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        if '?page=' not in entry.get('url', '') and entry.get('body'):
+            pages.append(entry['body'])
+    for path in sorted(glob.glob(os.path.join(html_dir, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    logging.info(f"Loaded {len(pages)} course pages ({sum(map(len, pages)) / 1024:.0f} KB of HTML) from {html_dir}.")
+    return pages
+
+def benchmark_parser(pages, parser, repeats):
+    """Parses every page `repeats` times; reports CPU time per page and the parse results."""
+    cpu_ms = []
+    for _ in range(repeats):
+        for html in pages:
+            start = time.process_time()
+            parse_course_html(html, parser)
+            cpu_ms.append((time.process_time() - start) * 1000)
+    p50, p95 = np.percentile(cpu_ms, [50, 95])
+    return {
+        'parser': parser,
+        'pages': len(pages),
+        'cpu_ms_mean': float(np.mean(cpu_ms)),
+        'cpu_ms_p50': float(p50),
+        'cpu_ms_p95': float(p95),
+        'pages_per_cpu_second': 1000 / float(np.mean(cpu_ms)),
+    }
+
+def count_mismatches(pages, parser, reference='html.parser'):
+    """Pages where `parser` extracts different fields than the reference parser."""
+    return sum(parse_course_html(html, parser) != parse_course_html(html, reference) for html in pages)
+
+def main(args):
+    pages = load_html_pages(args.html_dir)
+    if not pages:
+        raise SystemExit(f"No saved course pages in {args.html_dir}; scrape once with the page cache enabled.")
+
+    results = [benchmark_parser(pages, parser, args.repeats) for parser in args.parsers]
+    baseline = next((result for result in results if result['parser'] == 'html.parser'), results[0])
+    for result in results:
+        result['speedup'] = baseline['cpu_ms_mean'] / result['cpu_ms_mean']
+        result['mismatches'] = count_mismatches(pages, result['parser'])
+
+    # Display the results
+    header = f"{'parser':<12} {'pages':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'pages/s':>9} {'speedup':>8} {'diff':>5}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        print(f"{result['parser']:<12} {result['pages']:>6} {result['cpu_ms_mean']:>9.3f} {result['cpu_ms_p50']:>8.3f} "
+              f"{result['cpu_ms_p95']:>8.3f} {result['pages_per_cpu_second']:>9.0f} {result['speedup']:>7.1f}x "
+              f"{result['mismatches']:>5}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'html_dir': args.html_dir, 'repeats': args.repeats, 'results': results}, f, indent=2)
+        logging.info(f"Results saved at: {args.output}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Compare HTML parsing backends on saved course pages by CPU time per page.")
+    parser.add_argument("--html_dir", type=str, default=PAGE_CACHE_DIR, help="Scraper page cache or directory of saved .html pages.")
+    parser.add_argument("--parsers", type=str, nargs='+', default=list(PARSERS), choices=PARSERS, help="Parsers to benchmark.")
+    parser.add_argument("--repeats", type=int, default=5, help="Times each page is parsed per parser.")
+    parser.add_argument("--output", type=str, default=None, help="Optional path to save the results as JSON.")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,82 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from search_queries import EMBEDDINGS_PATH, INDEX_PATH, memory_usage_mb, read_index
+
+def cold_start(index_path, embeddings_path, mmap, num_queries, top_k):
+    """
+    Runs in a fresh process: loads the index and embeddings, answers a few queries
+    and reports load time, first-search latency and resident memory.
+    """
+    baseline = memory_usage_mb()
+
+    start = time.perf_counter()
+    index = read_index(index_path, mmap)
+    embeddings = np.load(embeddings_path, mmap_mode='r' if mmap else None)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((num_queries, index.d)).astype('float32')
+    start = time.perf_counter()
+    index.search(queries, min(top_k, index.ntotal))
+    search_ms = (time.perf_counter() - start) * 1000
+
+    usage = memory_usage_mb()
+    result = {
+        'mmap': mmap,
+        'load_ms': round(load_ms, 2),
+        'first_search_ms': round(search_ms, 2),
+        'num_vectors': int(index.ntotal),
+        'embeddings_mb': round(embeddings.nbytes / (1024 ** 2), 3),
+    }
+    result['rss_mb'] = round(usage['rss'], 1)
+    if usage['file'] is not None:
+        result.update({
+            'added_file_mb': round(usage['file'] - baseline['file'], 1),
+            'added_private_mb': round(usage['anon'] - baseline['anon'], 1),
+        })
+    return result
+
+def main(args):
+    # "spawn" gives every worker a clean interpreter, like a new Streamlit or search process
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for mode in args.modes:
+        mmap = mode == 'mmap'
+        jobs = [(args.index_path, args.embeddings_path, mmap, args.num_queries, args.top_k)] * args.processes
+        with context.Pool(args.processes) as pool:
+            results.extend(pool.starmap(cold_start, jobs))
+
+    # Display the results
+    header = f"{'mode':<7} {'load ms':>9} {'search ms':>10} {'RSS MB':>9} {'+file MB':>9} {'+private MB':>12}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        mode = 'mmap' if result['mmap'] else 'memory'
+        print(f"{mode:<7} {result['load_ms']:>9.1f} {result['first_search_ms']:>10.1f} "
+              f"{result.get('rss_mb', float('nan')):>9.1f} {result.get('added_file_mb', float('nan')):>9.1f} "
+              f"{result.get('added_private_mb', float('nan')):>12.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'processes': args.processes, 'results': results}, f, indent=2)
+        logging.info(f"Results saved at: {args.output}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Measure per-process cold-start time and memory of the vector store, with and without mmap.")
+    parser.add_argument("--index_path", type=str, default=INDEX_PATH, help="Path to the FAISS index file.")
+    parser.add_argument("--embeddings_path", type=str, default=EMBEDDINGS_PATH, help="Path to the embeddings file.")
+    parser.add_argument("--processes", type=int, default=4, help="Number of concurrent search processes to start.")
+    parser.add_argument("--modes", type=str, nargs='+', default=['mmap', 'memory'], choices=['mmap', 'memory'], help="Loading modes to compare.")
+    parser.add_argument("--num_queries", type=int, default=10, help="Queries run after loading to touch the index.")
+    parser.add_argument("--top_k", type=int, default=10, help="Number of results per query.")
+    parser.add_argument("--output", type=str, default=None, help="Optional path to save the results as JSON.")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+# Default location of the metadata store, next to the FAISS index
+STORE_PATH = "vector_store/course_metadata.sqlite"
+
+# Catalog columns kept in the store and returned with every search hit
+METADATA_COLUMNS = ['course_title', 'course_url', 'course_level', 'course_rating', 'price', 'course_duration']
+
+
+@lru_cache(maxsize=65536)
+def course_id(course_url):
+    """
+    Stable id of a course: the first 63 bits of the SHA-1 of its URL, so it fits
+    a non-negative int64 (FAISS ids) and survives reordering of the catalog.
+    """
+    return int(hashlib.sha1(str(course_url).encode('utf-8')).hexdigest()[:16], 16) >> 1
+
+
+def course_ids(course_urls):
+    """Stable ids for a sequence of course URLs, as an int64 array."""
+    return np.array([course_id(url) for url in course_urls], dtype='int64')
+
+
+def passage_ids(course_urls, chunk_numbers):
+    """
+    Stable FAISS ids of embedded passages. The first passage of a course uses the
+    course id itself; further chunks hash the URL with a `#chunk<n>` suffix.
+    """
+    return np.array([
+        course_id(url) if n == 0 else course_id(f"{url}#chunk{n}")
+        for url, n in zip(course_urls, chunk_numbers)
+    ], dtype='int64')
+
+
+def text_hash(text):
+    """Hash of the text a course embedding was computed from."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def save_course_store(path, courses, ids, passages, settings=None):
+    """
+    Writes the metadata store: a `courses` table with one row per course keyed by
+    its stable id, and a `passages` table with one row per embedded passage
+    (FAISS id, course id, hash of the embedded text, row in the embeddings file).
+    `passages` is an iterable of such 4-tuples. `settings` (name -> value) records
+    how the embeddings were computed, e.g. the model and metric, in a `settings` table.
+    The file is rebuilt in a temporary location and swapped in atomically.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    columns = ', '.join(METADATA_COLUMNS)
+    placeholders = ', '.join('?' * (len(METADATA_COLUMNS) + 1))
+    records = courses[METADATA_COLUMNS].astype(object).where(courses[METADATA_COLUMNS].notna(), None)
+    rows = [(int(cid), *values) for cid, values in zip(ids, records.itertuples(index=False))]
+    passage_rows = [
+        (int(pid), int(cid), hash_, int(embedding_row)) for pid, cid, hash_, embedding_row in passages
+    ]
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute(f"CREATE TABLE courses (course_id INTEGER PRIMARY KEY, {columns})")
+        connection.executemany(
+            f"INSERT OR REPLACE INTO courses (course_id, {columns}) VALUES ({placeholders})", rows
+        )
+        connection.execute(
+            "CREATE TABLE passages (passage_id INTEGER PRIMARY KEY, course_id INTEGER NOT NULL, "
+            "text_hash TEXT NOT NULL, embedding_row INTEGER NOT NULL)"
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO passages (passage_id, course_id, text_hash, embedding_row) VALUES (?, ?, ?, ?)",
+            passage_rows
+        )
+        connection.execute("CREATE TABLE settings (name TEXT PRIMARY KEY, value TEXT)")
+        connection.executemany(
+            "INSERT INTO settings (name, value) VALUES (?, ?)",
+            [(name, str(value)) for name, value in (settings or {}).items()]
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+
+
+class CourseStore:
+    """
+    Read-only access to the metadata store. Lookups by course id use the
+    table's primary key, so resolving a search hit never reads the catalog CSV.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Stores written before long texts were chunked keep one embedding per course
+        # in the courses table, where the FAISS id is the course id
+        with self._lock:
+            self._has_passages = self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'passages'"
+            ).fetchone() is not None
+        self._vectors_table, self._vector_id = (
+            ('passages', 'passage_id') if self._has_passages else ('courses', 'course_id')
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+
+    def get_many(self, ids):
+        """Metadata dicts for `ids`, in the same order; unknown ids give None."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT course_id, {', '.join(METADATA_COLUMNS)} FROM courses WHERE course_id IN ({placeholders})",
+                ids
+            ).fetchall()
+        found = {row['course_id']: dict(row) for row in rows}
+        return [found.get(i) for i in ids]
+
+    def get(self, course_id):
+        """Metadata dict for one course id, or None."""
+        return self.get_many([course_id])[0]
+
+    def embedding_rows(self):
+        """Map text hash -> row in the embeddings file, used to reuse unchanged embeddings."""
+        with self._lock:
+            rows = self._connection.execute(f"SELECT text_hash, embedding_row FROM {self._vectors_table}").fetchall()
+        return {row['text_hash']: row['embedding_row'] for row in rows}
+
+    def text_hashes(self):
+        """Map FAISS id -> hash of the text its indexed embedding was computed from."""
+        with self._lock:
+            rows = self._connection.execute(f"SELECT {self._vector_id}, text_hash FROM {self._vectors_table}").fetchall()
+        return {row[0]: row['text_hash'] for row in rows}
+
+    def settings(self):
+        """Map setting name -> value the embeddings were computed with; empty for older stores."""
+        with self._lock:
+            if self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'settings'"
+            ).fetchone() is None:
+                return {}
+            rows = self._connection.execute("SELECT name, value FROM settings").fetchall()
+        return {row['name']: row['value'] for row in rows}
+
+    def passage_courses(self):
+        """
+        (passage ids, course ids) as int64 arrays sorted by passage id, to map
+        FAISS hits back to courses. None for a store with one vector per course.
+        """
+        if not self._has_passages:
+            return None
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT passage_id, course_id FROM passages ORDER BY passage_id"
+            ).fetchall()
+        ids = np.array([tuple(row) for row in rows], dtype='int64').reshape(-1, 2)
+        return ids[:, 0], ids[:, 1]
+
+    def close(self):
+        self._connection.close()
@@ -1,148 +1,559 @@
-import pandas as pd
-import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
-import logging
-from tqdm import tqdm
-import os
-import argparse
-import psutil
-
-# Setup logging for better debugging and progress tracking
-logging.basicConfig(
-    level=logging.INFO, 
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-def log_memory_usage():
-    """
-    Logs the current memory usage for monitoring purposes.
-    """
-    process = psutil.Process(os.getpid())
-    mem_usage = process.memory_info().rss / (1024 ** 2)  # Convert to MB
-    logging.info(f"Current memory usage: {mem_usage:.2f} MB")
-
-def load_data(file_path):
-    """
-    Loads the dataset from the given file path.
-    """
-    if not os.path.exists(file_path):
-        logging.error(f"File not found: {file_path}")
-        raise FileNotFoundError(f"Input file does not exist at: {file_path}")
-    
-    logging.info(f"Loading data from {file_path}...")
-    
-    try:
-        # Try reading with 'ISO-8859-1' encoding to handle special characters
-        return pd.read_csv(file_path, encoding='ISO-8859-1')
-    except Exception as e:
-        logging.error(f"Error loading the CSV file: {e}")
-        raise
-
-
-def clean_data(df):
-    """
-    Cleans and validates the course data.
-    Removes rows with missing or empty critical columns and trims whitespace.
-    """
-    logging.info("Cleaning course data...")
-    df = df.dropna(subset=['course_title', 'course_description'])  # Remove rows with missing critical data
-    df['course_title'] = df['course_title'].str.strip()
-    df['course_description'] = df['course_description'].str.strip()
-    df = df[(df['course_title'] != '') & (df['course_description'] != '')]  # Remove empty rows
-    
-    logging.info(f"Data cleaned. Remaining courses: {len(df)}")
-    return df
-
-def generate_embeddings(texts, model, batch_size=32):
-    """
-    Generates embeddings for the given texts in batches.
-    """
-    logging.info("Generating embeddings...")
-    embeddings = []
-    for i in tqdm(range(0, len(texts), batch_size), desc="Embedding batches"):
-        batch_texts = texts[i:i + batch_size]
-        batch_embeddings = model.encode(batch_texts, show_progress_bar=False)
-        embeddings.append(batch_embeddings)
-    embeddings = np.vstack(embeddings)
-    logging.info(f"Generated embeddings for {len(texts)} texts.")
-    return embeddings
-
-def create_faiss_index(embeddings):
-    """
-    Creates a FAISS index from the given embeddings.
-    """
-    logging.info("Creating FAISS index...")
-    dimension = embeddings.shape[1]  # Embedding dimensionality
-    index = faiss.IndexFlatL2(dimension)  # L2 distance for similarity search
-    index.add(embeddings)
-    logging.info("FAISS index created successfully.")
-    return index
-
-def save_embeddings_and_index(embeddings, index, embeddings_path, index_path):
-    """
-    Saves the embeddings and FAISS index to the specified file paths.
-    """
-    logging.info("Saving embeddings and FAISS index...")
-    os.makedirs(os.path.dirname(embeddings_path), exist_ok=True)
-    os.makedirs(os.path.dirname(index_path), exist_ok=True)
-
-    np.save(embeddings_path, embeddings)  # Save embeddings
-    faiss.write_index(index, index_path)  # Save index
-    logging.info(f"Embeddings saved at: {embeddings_path}")
-    logging.info(f"FAISS index saved at: {index_path}")
-
-def main(args):
-    # Parameters from arguments
-    input_csv_path = args.input_csv_path
-    embeddings_path = args.embeddings_path
-    index_path = args.index_path
-    embedding_model_name = args.embedding_model_name
-    embedding_batch_size = args.batch_size
-
-    try:
-        # Load course data
-        df = load_data(input_csv_path)
-
-        # Clean the data
-        df = clean_data(df)
-
-        # Combine relevant fields for embedding
-        df['combined_text'] = (
-            df['course_title'] + " " +
-            df['course_description'] + " " +
-            df.get('course_curriculum', '').fillna("")  # Add curriculum if present
-        )
-
-        # Initialize the embedding model
-        logging.info(f"Initializing embedding model: {embedding_model_name}")
-        model = SentenceTransformer(embedding_model_name)
-
-        # Log memory usage before generating embeddings
-        log_memory_usage()
-
-        # Generate embeddings
-        embeddings = generate_embeddings(df['combined_text'].tolist(), model, batch_size=embedding_batch_size)
-
-        # Create FAISS index
-        index = create_faiss_index(embeddings)
-
-        # Save embeddings and index
-        save_embeddings_and_index(embeddings, index, embeddings_path, index_path)
-
-        logging.info("Process completed successfully.")
-    
-    except Exception as e:
-        logging.error(f"An error occurred: {e}")
-
-if __name__ == "__main__":
-    # Argument parser for dynamic input/output
-    parser = argparse.ArgumentParser(description="Generate embeddings and create a FAISS index for courses.")
-    parser.add_argument("--input_csv_path", type=str, required=True, help="Path to the input CSV file.")
-    parser.add_argument("--embeddings_path", type=str, required=True, help="Path to save the embeddings file.")
-    parser.add_argument("--index_path", type=str, required=True, help="Path to save the FAISS index file.")
-    parser.add_argument("--embedding_model_name", type=str, default="paraphrase-MiniLM-L6-v2", help="Name or path of the embedding model.")
-    parser.add_argument("--batch_size", type=int, default=32, help="Batch size for embedding generation.")
-    args = parser.parse_args()
-
-    main(args)
+import numpy as np
+from sentence_transformers import SentenceTransformer
+import faiss
+import logging
+from tqdm import tqdm
+import os
+import re
+import sys
+import time
+import textwrap
+import argparse
+import psutil
+from course_store import CourseStore, course_ids, passage_ids, save_course_store, text_hash
+
+# The catalog schema lives in app/catalog.py; make app/ importable
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+from catalog import read_catalog
+
+# Setup logging for better debugging and progress tracking
+logging.basicConfig(
+    level=logging.INFO, 
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+def log_memory_usage():
+    """
+    Logs the current memory usage for monitoring purposes.
+    """
+    process = psutil.Process(os.getpid())
+    mem_usage = process.memory_info().rss / (1024 ** 2)  # Convert to MB
+    logging.info(f"Current memory usage: {mem_usage:.2f} MB")
+
+def load_data(file_path):
+    """
+    Loads the dataset from the given file path.
+    """
+    if not os.path.exists(file_path):
+        logging.error(f"File not found: {file_path}")
+        raise FileNotFoundError(f"Input file does not exist at: {file_path}")
+    
+    logging.info(f"Loading data from {file_path}...")
+    
+    try:
+        # Typed Parquet catalog (see build_catalog.py); a scraped CSV is typed the same way
+        return read_catalog(file_path)
+    except Exception as e:
+        logging.error(f"Error loading the catalog file: {e}")
+        raise
+
+
+def clean_data(df):
+    """
+    Cleans and validates the course data.
+    Removes rows with missing or empty critical columns and trims whitespace.
+    """
+    logging.info("Cleaning course data...")
+    df = df.dropna(subset=['course_title', 'course_description'])  # Remove rows with missing critical data
+    df['course_title'] = df['course_title'].str.strip()
+    df['course_description'] = df['course_description'].str.strip()
+    df = df[(df['course_title'] != '') & (df['course_description'] != '')]  # Remove empty rows
+    
+    logging.info(f"Data cleaned. Remaining courses: {len(df)}")
+    return df
+
+# Automatic batch sizing: aim for about this many tokens per batch
+TOKEN_BUDGET = 8192
+MIN_BATCH_SIZE = 8
+MAX_BATCH_SIZE = 256
+CHARS_PER_TOKEN = 4  # Rough average for English text
+
+# Texts handed to the multi-process pool at a time, which bounds the memory in flight
+CHUNK_SIZE = 10000
+
+def embedding_dimension(model):
+    """
+    Returns the size of the model's embeddings.
+    """
+    dimension = model.get_sentence_embedding_dimension()
+    return dimension or len(model.encode(["dimension probe"], show_progress_bar=False)[0])
+
+def auto_batch_size(texts, model, token_budget=TOKEN_BUDGET):
+    """
+    Picks a batch size from the text lengths so that a batch holds about
+    `token_budget` tokens: long curricula get small batches, titles large ones.
+    Texts longer than the model's max sequence length are truncated by the
+    model, so they count as that length.
+    """
+    max_tokens = model.get_max_seq_length() or 512
+    lengths = [min(len(text) / CHARS_PER_TOKEN, max_tokens) for text in texts[:CHUNK_SIZE]]
+    mean_tokens = max(np.mean(lengths) if lengths else max_tokens, 1)
+    return int(np.clip(token_budget // mean_tokens, MIN_BATCH_SIZE, MAX_BATCH_SIZE))
+
+def allocate_embeddings(shape, scratch_path=None):
+    """
+    Preallocates the float32 embedding matrix, in memory or, with `scratch_path`,
+    as a memory-mapped .npy file so a large corpus does not have to fit in RAM.
+    """
+    if scratch_path is None:
+        return np.empty(shape, dtype='float32')
+    return np.lib.format.open_memmap(scratch_path, mode='w+', dtype='float32', shape=shape)
+
+def length_batches(texts, batch_size, max_tokens, token_budget=TOKEN_BUDGET):
+    """
+    Yields batches of text positions, longest texts first, so every batch holds
+    texts of similar length and little compute is spent on padding. With
+    batch_size 'auto' each batch holds about `token_budget` tokens, so batches
+    of short texts are larger than batches of long ones.
+    """
+    order = np.argsort([-len(text) for text in texts], kind='stable')
+    start = 0
+    while start < len(order):
+        size = batch_size
+        if batch_size == 'auto':
+            longest_tokens = max(min(len(texts[order[start]]) / CHARS_PER_TOKEN, max_tokens), 1)
+            size = int(np.clip(token_budget // longest_tokens, MIN_BATCH_SIZE, MAX_BATCH_SIZE))
+        yield order[start:start + size]
+        start += size
+
+def generate_embeddings(texts, model, batch_size=32, out=None, workers=1):
+    """
+    Generates embeddings for the given texts in length-sorted batches, writing
+    each batch straight into its rows of `out` (a preallocated or memory-mapped
+    array with one row per text) so the matrix is never held twice. With several
+    workers the texts are encoded by a sentence-transformers multi-process pool,
+    one chunk at a time. `batch_size` may be 'auto' to size batches from the text lengths.
+    """
+    if out is None:
+        out = allocate_embeddings((len(texts), embedding_dimension(model)))
+
+    logging.info(f"Generating embeddings (batch size {batch_size}, {workers} worker(s))...")
+    start = time.perf_counter()
+    if workers > 1:
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        pool = model.start_multi_process_pool(target_devices=['cpu'] * workers)
+        try:
+            for i in tqdm(range(0, len(texts), CHUNK_SIZE), desc="Embedding chunks"):
+                chunk = order[i:i + CHUNK_SIZE]
+                chunk_texts = [texts[j] for j in chunk]
+                chunk_batch_size = auto_batch_size(chunk_texts, model) if batch_size == 'auto' else batch_size
+                out[chunk] = model.encode_multi_process(chunk_texts, pool, batch_size=chunk_batch_size)
+        finally:
+            model.stop_multi_process_pool(pool)
+    else:
+        max_tokens = model.get_max_seq_length() or 512
+        for batch in tqdm(list(length_batches(texts, batch_size, max_tokens)), desc="Embedding batches"):
+            out[batch] = model.encode([texts[j] for j in batch], show_progress_bar=False)
+    elapsed = time.perf_counter() - start
+    logging.info(f"Generated embeddings for {len(texts)} texts ({len(texts) / max(elapsed, 1e-9):.1f} texts/sec).")
+    return out
+
+# Long course text is split into passages that fit the model's input; this
+# default matches the max sequence length of the default model (in tokens)
+CHUNK_TOKENS = 128
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+def split_passages(title, description, curriculum, max_chars):
+    """
+    Splits one course into passages of at most about `max_chars` characters,
+    each starting with the course title so it keeps its context. The description
+    is split at sentence ends and the curriculum at its comma-separated items;
+    these pieces are packed greedily, so the first passage is normally the title
+    and description. With max_chars 0 the whole text is a single passage.
+    """
+    if not max_chars:
+        return [" ".join(part for part in (title, description, curriculum) if part)]
+
+    budget = max(max_chars - len(title) - 1, max_chars // 2)
+    pieces = [(sentence, " ") for sentence in SENTENCE_BOUNDARY.split(description or "") if sentence]
+    pieces += [(item, ", ") for item in (curriculum or "").split(", ") if item]
+
+    chunks, current = [], ""
+    for piece, separator in pieces:
+        for part in textwrap.wrap(piece, budget):  # Oversized pieces break at spaces
+            if current and len(current) + len(separator) + len(part) > budget:
+                chunks.append(current)
+                current = ""
+            current = f"{current}{separator}{part}" if current else part
+    if current:
+        chunks.append(current)
+    return [f"{title} {chunk}" for chunk in chunks] or [title]
+
+def build_passages(df, max_chars):
+    """
+    Splits every course of `df` into passages. Returns (course positions, chunk
+    numbers, passage texts), one entry per passage.
+    """
+    positions, numbers, texts = [], [], []
+    curricula = df['course_curriculum'].fillna("") if 'course_curriculum' in df else [""] * len(df)
+    for position, (title, description, curriculum) in enumerate(zip(df['course_title'], df['course_description'], curricula)):
+        for number, text in enumerate(split_passages(title, description, curriculum, max_chars)):
+            positions.append(position)
+            numbers.append(number)
+            texts.append(text)
+    return np.asarray(positions, dtype='int64'), np.asarray(numbers, dtype='int64'), texts
+
+def embedding_settings(model_name, metric, storage):
+    """What the stored embeddings depend on besides the text; vectors are only reused when all of it matches."""
+    return {'embedding_model': model_name, 'metric': metric, 'storage': storage}
+
+def load_previous_embeddings(embeddings_path, store_path, settings):
+    """
+    Loads the state of a previous run from its embeddings and metadata store.
+    Returns ({text hash: embedding}, {FAISS id: indexed text hash}); both are
+    empty if there is no previous run, or if it used other `settings` (a
+    different model, metric or storage), whose vectors cannot be mixed with new ones.
+    """
+    if not (os.path.exists(embeddings_path) and os.path.exists(store_path)):
+        logging.info("No previous embeddings found; every course will be encoded.")
+        return {}, {}
+
+    store = CourseStore(store_path)
+    try:
+        previous_settings = store.settings()
+        embedding_rows = store.embedding_rows()
+        indexed_hashes = store.text_hashes()
+    finally:
+        store.close()
+    settings = {name: str(value) for name, value in settings.items()}
+    if previous_settings != settings:
+        logging.info(f"Previous embeddings were built with {previous_settings or 'unrecorded settings'}, "
+                     f"not {settings}; every course will be encoded.")
+        return {}, {}
+
+    embeddings = load_embeddings(embeddings_path)
+    if embedding_rows and max(embedding_rows.values()) >= len(embeddings):
+        logging.warning("Previous store and embeddings do not match; every course will be encoded.")
+        return {}, {}
+    return {hash_: embeddings[row] for hash_, row in embedding_rows.items()}, indexed_hashes
+
+# Supported FAISS index types and their default parameters
+INDEX_TYPES = ['flat', 'hnsw', 'ivf', 'ivfpq']
+DEFAULT_INDEX_PARAMS = {
+    'hnsw_m': 32,  # HNSW graph neighbours per node
+    'ef_construction': 200,  # HNSW candidate list size while building
+    'ef_search': 64,  # HNSW candidate list size while searching
+    'nlist': 100,  # IVF coarse clusters (capped at the number of vectors)
+    'nprobe': 8,  # IVF clusters visited per query
+    'pq_m': 16,  # IVF-PQ sub-quantizers (must divide the embedding dimension)
+    'pq_bits': 8,  # IVF-PQ bits per sub-quantizer code
+}
+
+# Similarity metrics and vector storage formats
+METRICS = ['l2', 'cosine']
+STORAGE_TYPES = ['float32', 'float16', 'int8']
+SQ_TYPES = {
+    'float16': faiss.ScalarQuantizer.QT_fp16,
+    'int8': faiss.ScalarQuantizer.QT_8bit,  # Per-dimension min/max learned in training
+}
+
+def to_storage(embeddings, storage):
+    """
+    Converts float32 embeddings to the on-disk storage type. int8 maps the
+    [-1, 1] range of unit vectors to [-127, 127], so it requires cosine mode.
+    """
+    if storage == 'float16':
+        return embeddings.astype('float16')
+    if storage == 'int8':
+        return np.clip(np.round(embeddings * 127), -127, 127).astype('int8')
+    return embeddings.astype('float32', copy=False)
+
+def load_embeddings(embeddings_path):
+    """
+    Loads an embeddings file written in any storage type as float32.
+    """
+    embeddings = np.load(embeddings_path)
+    if embeddings.dtype == np.int8:
+        return embeddings.astype('float32') / 127
+    if embeddings.dtype != np.float32:
+        return embeddings.astype('float32')
+    return embeddings
+
+def build_base_index(embeddings, index_type='flat', metric='l2', storage='float32', **index_params):
+    """
+    Creates an empty FAISS index of the requested type, trained on `embeddings`
+    when it needs training (IVF, int8 scalar quantizer). Cosine similarity is an
+    inner product over normalized vectors. float16/int8 storage keeps the vectors
+    in a scalar quantizer (IVF-PQ is compressed already and ignores it).
+    Search-time parameters (efSearch, nprobe) are stored in the index.
+    """
+    params = {**DEFAULT_INDEX_PARAMS, **index_params}
+    num_vectors, dimension = embeddings.shape
+    faiss_metric = faiss.METRIC_INNER_PRODUCT if metric == 'cosine' else faiss.METRIC_L2
+    sq_type = SQ_TYPES.get(storage)
+
+    if index_type == 'flat':
+        if sq_type is None:
+            index = faiss.IndexFlat(dimension, faiss_metric)
+        else:
+            index = faiss.IndexScalarQuantizer(dimension, sq_type, faiss_metric)
+
+    elif index_type == 'hnsw':
+        if sq_type is None:
+            index = faiss.IndexHNSWFlat(dimension, params['hnsw_m'], faiss_metric)
+        else:
+            index = faiss.IndexHNSWSQ(dimension, sq_type, params['hnsw_m'], faiss_metric)
+        index.hnsw.efConstruction = params['ef_construction']
+        index.hnsw.efSearch = params['ef_search']
+
+    elif index_type in ('ivf', 'ivfpq'):
+        nlist = max(1, min(params['nlist'], num_vectors))
+        quantizer = faiss.IndexFlat(dimension, faiss_metric)
+        if index_type == 'ivf' and sq_type is None:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss_metric)
+        elif index_type == 'ivf':
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dimension, nlist, sq_type, faiss_metric)
+        else:
+            if dimension % params['pq_m']:
+                raise ValueError(f"pq_m={params['pq_m']} must divide the embedding dimension {dimension}")
+            # Each sub-quantizer needs at least 2^bits training vectors
+            pq_bits = min(params['pq_bits'], max(1, int(np.log2(num_vectors))))
+            if pq_bits != params['pq_bits']:
+                logging.warning(f"Only {num_vectors} vectors; using pq_bits={pq_bits} instead of {params['pq_bits']}.")
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, params['pq_m'], pq_bits, faiss_metric)
+        index.nprobe = min(params['nprobe'], nlist)
+
+    else:
+        raise ValueError(f"Unknown index type: {index_type} (expected one of {', '.join(INDEX_TYPES)})")
+
+    if not index.is_trained:
+        logging.info(f"Training {index_type} index...")
+        index.train(embeddings)
+    return index
+
+def describe_index(index):
+    """
+    Returns (index type, metric, storage) of an index, looking through an IndexIDMap.
+    """
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    metric = 'cosine' if inner.metric_type == faiss.METRIC_INNER_PRODUCT else 'l2'
+
+    if isinstance(inner, faiss.IndexHNSW):
+        index_type, storage_index = 'hnsw', faiss.downcast_index(inner.storage)
+    elif isinstance(inner, faiss.IndexIVFPQ):
+        return 'ivfpq', metric, 'float32'
+    elif isinstance(inner, faiss.IndexIVF):
+        index_type, storage_index = 'ivf', inner
+    else:
+        index_type, storage_index = 'flat', inner
+
+    storage = 'float32'
+    if isinstance(storage_index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        storage = {qtype: name for name, qtype in SQ_TYPES.items()}.get(storage_index.sq.qtype, 'float32')
+    return index_type, metric, storage
+
+def index_type_of(index):
+    """Returns the INDEX_TYPES name of an index, looking through an IndexIDMap."""
+    return describe_index(index)[0]
+
+def create_faiss_index(embeddings, ids=None, index_type='flat', metric='l2', storage='float32', **index_params):
+    """
+    Creates a FAISS index of the given type, metric and storage from the given embeddings.
+    With `ids`, the index is wrapped in an IndexIDMap so courses can later be
+    added or removed in place.
+    """
+    logging.info(f"Creating {index_type} FAISS index ({metric}, {storage})...")
+    index = build_base_index(embeddings, index_type, metric, storage, **index_params)
+    if ids is None:
+        index.add(embeddings)
+    else:
+        index = faiss.IndexIDMap(index)
+        unique_ids, first_rows = np.unique(ids, return_index=True)  # A course listed twice (same URL) is indexed once
+        index.add_with_ids(embeddings[first_rows], unique_ids)
+    logging.info("FAISS index created successfully.")
+    return index
+
+def update_faiss_index(index, ids, embeddings, changed_ids=()):
+    """
+    Updates an IndexIDMap in place so it holds exactly `ids`: ids that disappeared
+    or whose text changed (`changed_ids`) are removed, and only those are re-added.
+    Returns None if vectors cannot be removed, so the index must be rebuilt: HNSW
+    does not support removal, and IVF lists keep the old positions of the
+    remaining vectors, which would no longer match the compacted id map.
+    """
+    indexed_ids = faiss.vector_to_array(index.id_map)
+    unique_ids, first_rows = np.unique(ids, return_index=True)
+
+    stale_ids = np.union1d(
+        np.setdiff1d(indexed_ids, unique_ids),
+        np.intersect1d(indexed_ids, np.asarray(list(changed_ids), dtype='int64'))
+    )
+    if len(stale_ids):
+        if index_type_of(index) != 'flat':
+            logging.info(f"Cannot remove vectors from an ID-mapped {index_type_of(index)} index; rebuilding the index.")
+            return None
+        index.remove_ids(stale_ids)
+
+    new = ~np.isin(unique_ids, np.setdiff1d(indexed_ids, stale_ids))
+    if new.any():
+        index.add_with_ids(embeddings[first_rows[new]], unique_ids[new])
+
+    logging.info(f"FAISS index updated: {int(new.sum())} added, {len(stale_ids)} removed, {index.ntotal} total.")
+    return index
+
+def load_updatable_index(index_path, index_type='flat', metric='l2', storage='float32'):
+    """
+    Loads an existing ID-mapped index with the requested configuration for an
+    incremental update, or returns None if there is none (e.g. an old index built
+    without ids, or one of another type, metric or storage).
+    """
+    if not os.path.exists(index_path):
+        return None
+    index = faiss.read_index(index_path)
+    if not isinstance(index, faiss.IndexIDMap):
+        logging.info("Existing index has no id map; rebuilding it.")
+        return None
+    requested = (index_type, metric, 'float32' if index_type == 'ivfpq' else storage)
+    if describe_index(index) != requested:
+        logging.info(f"Existing index is {describe_index(index)}, not {requested}; rebuilding it.")
+        return None
+    return index
+
+def save_embeddings_and_index(embeddings, index, embeddings_path, index_path, storage='float32'):
+    """
+    Saves the embeddings (in the given storage type) and FAISS index to the specified file paths.
+    """
+    logging.info("Saving embeddings and FAISS index...")
+    os.makedirs(os.path.dirname(embeddings_path), exist_ok=True)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+
+    np.save(embeddings_path, to_storage(embeddings, storage))  # Save embeddings
+    faiss.write_index(index, index_path)  # Save index
+    logging.info(f"Embeddings saved at: {embeddings_path}")
+    logging.info(f"FAISS index saved at: {index_path}")
+
+def main(args):
+    # Parameters from arguments
+    input_path = args.input_path
+    embeddings_path = args.embeddings_path
+    index_path = args.index_path
+    embedding_model_name = args.embedding_model_name
+    embedding_batch_size = args.batch_size
+    workers = args.workers or os.cpu_count() or 1
+    store_path = args.metadata_path or os.path.join(os.path.dirname(index_path), "course_metadata.sqlite")
+    index_type = args.index_type
+    index_params = {name: getattr(args, name) for name in DEFAULT_INDEX_PARAMS}
+    metric = args.metric
+    storage = args.storage
+    settings = embedding_settings(embedding_model_name, metric, storage)
+    scratch_path = os.path.splitext(embeddings_path)[0] + ".partial.npy" if args.memmap else None
+    embeddings = None
+
+    try:
+        # Load course data
+        df = load_data(input_path)
+
+        # Clean the data
+        df = clean_data(df)
+
+        # Split title, description and curriculum into passages that fit the model
+        positions, chunk_numbers, texts = build_passages(df, args.chunk_tokens * CHARS_PER_TOKEN)
+        hashes = [text_hash(text) for text in texts]
+        logging.info(f"{len(df)} courses split into {len(texts)} passages.")
+
+        # Stable course ids from the course URL (title when the URL is missing), and passage ids from those
+        course_keys = df['course_url'].where(df['course_url'].notna(), df['course_title'])
+        ids = course_ids(course_keys)
+        vector_ids = passage_ids(course_keys.iloc[positions], chunk_numbers)
+
+        # In incremental mode, reuse the embeddings of texts that were already encoded
+        previous, indexed_hashes = (
+            load_previous_embeddings(embeddings_path, store_path, settings) if args.incremental else ({}, {})
+        )
+        to_encode = [i for i, hash_ in enumerate(hashes) if hash_ not in previous]
+        logging.info(f"{len(texts) - len(to_encode)} embeddings reused, {len(to_encode)} to encode.")
+
+        if to_encode or not previous:
+            # Initialize the embedding model; with nothing to reuse it also gives the dimension
+            logging.info(f"Initializing embedding model: {embedding_model_name}")
+            model = SentenceTransformer(embedding_model_name)
+            dimension = embedding_dimension(model)
+
+            # Log memory usage before generating embeddings
+            log_memory_usage()
+        else:
+            dimension = len(next(iter(previous.values())))
+
+        # Assemble the embeddings in passage order in one preallocated matrix:
+        # reused vectors are copied in, new ones are encoded straight into it
+        embeddings = allocate_embeddings((len(texts), dimension), scratch_path)
+        for i, hash_ in enumerate(hashes):
+            if hash_ in previous:
+                embeddings[i] = previous[hash_]
+
+        if to_encode and len(to_encode) == len(texts):
+            generate_embeddings(texts, model, embedding_batch_size, out=embeddings, workers=workers)
+        elif to_encode:
+            embeddings[to_encode] = generate_embeddings(
+                [texts[i] for i in to_encode], model, embedding_batch_size, workers=workers
+            )
+        if to_encode:
+            log_memory_usage()
+
+        # Cosine similarity is an inner product over unit-length vectors
+        if metric == 'cosine':
+            faiss.normalize_L2(embeddings)
+
+        # Create the FAISS index, or update the existing one in place
+        index = load_updatable_index(index_path, index_type, metric, storage) if indexed_hashes else None
+        if index is not None:
+            changed_ids = [
+                vector_id for vector_id, hash_ in zip(vector_ids.tolist(), hashes)
+                if indexed_hashes.get(vector_id, hash_) != hash_
+            ]
+            index = update_faiss_index(index, vector_ids, embeddings, changed_ids)
+        if index is None:
+            index = create_faiss_index(embeddings, vector_ids, index_type, metric, storage, **index_params)
+
+        # Save embeddings and index
+        save_embeddings_and_index(embeddings, index, embeddings_path, index_path, storage)
+
+        # Save the metadata store that maps FAISS ids back to courses
+        passages = zip(vector_ids, ids[positions], hashes, range(len(texts)))
+        save_course_store(store_path, df, ids, passages, settings)
+        logging.info(f"Course metadata saved at: {store_path}")
+
+        logging.info("Process completed successfully.")
+    
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
+        raise
+
+    finally:
+        # The scratch file is only needed while the embeddings are assembled
+        if scratch_path:
+            embeddings = None  # Release the memory map before deleting its file
+            if os.path.exists(scratch_path):
+                os.remove(scratch_path)
+
+if __name__ == "__main__":
+    # Argument parser for dynamic input/output
+    parser = argparse.ArgumentParser(description="Generate embeddings and create a FAISS index for courses.")
+    parser.add_argument("--input_path", "--input_csv_path", dest="input_path", type=str, required=True,
+                        help="Path to the course catalog (Parquet from build_catalog.py, or a scraped CSV).")
+    parser.add_argument("--embeddings_path", type=str, required=True, help="Path to save the embeddings file.")
+    parser.add_argument("--index_path", type=str, required=True, help="Path to save the FAISS index file.")
+    parser.add_argument("--embedding_model_name", type=str, default="paraphrase-MiniLM-L6-v2", help="Name or path of the embedding model.")
+    parser.add_argument("--batch_size", type=lambda value: value if value == 'auto' else int(value), default=32, help="Batch size for embedding generation, or 'auto' to size batches from text length.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of CPU processes encoding in parallel (sentence-transformers multi-process pool); 0 uses every core.")
+    parser.add_argument("--memmap", action="store_true", help="Assemble the embeddings in a memory-mapped scratch file instead of RAM, for very large catalogs.")
+    parser.add_argument("--metadata_path", type=str, default=None, help="Path to save the course metadata store (default: course_metadata.sqlite next to the index).")
+    parser.add_argument("--incremental", action="store_true", help="Only encode new or changed courses and update the existing index in place.")
+    parser.add_argument("--chunk_tokens", type=int, default=CHUNK_TOKENS, help="Approximate passage length in tokens for long course text; 0 embeds each course as one text.")
+    parser.add_argument("--index_type", type=str, default="flat", choices=INDEX_TYPES, help="FAISS index type.")
+    parser.add_argument("--hnsw_m", type=int, default=DEFAULT_INDEX_PARAMS['hnsw_m'], help="HNSW: neighbours per node.")
+    parser.add_argument("--ef_construction", type=int, default=DEFAULT_INDEX_PARAMS['ef_construction'], help="HNSW: build-time candidate list size.")
+    parser.add_argument("--ef_search", type=int, default=DEFAULT_INDEX_PARAMS['ef_search'], help="HNSW: search-time candidate list size.")
+    parser.add_argument("--nlist", type=int, default=DEFAULT_INDEX_PARAMS['nlist'], help="IVF/IVF-PQ: number of coarse clusters.")
+    parser.add_argument("--nprobe", type=int, default=DEFAULT_INDEX_PARAMS['nprobe'], help="IVF/IVF-PQ: clusters visited per query.")
+    parser.add_argument("--pq_m", type=int, default=DEFAULT_INDEX_PARAMS['pq_m'], help="IVF-PQ: number of sub-quantizers.")
+    parser.add_argument("--pq_bits", type=int, default=DEFAULT_INDEX_PARAMS['pq_bits'], help="IVF-PQ: bits per sub-quantizer code.")
+    parser.add_argument("--metric", type=str, default="l2", choices=METRICS, help="Similarity metric; cosine normalizes the embeddings.")
+    parser.add_argument("--storage", type=str, default="float32", choices=STORAGE_TYPES, help="Precision of the stored embeddings and index vectors.")
+    args = parser.parse_args()
+    if args.storage == 'int8' and args.metric != 'cosine':
+        parser.error("--storage int8 requires --metric cosine (int8 codes assume unit-length vectors)")
+
+    main(args)
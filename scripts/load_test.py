@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+import httpx
+import numpy as np
+
+# Mix of short tool names and longer natural-language queries
+DEFAULT_QUERIES = [
+    "python", "data analysis with Python", "introduction to generative AI", "LangChain",
+    "deep learning for computer vision", "MECE", "free beginner course on machine learning",
+    "large language models", "prompt engineering", "time series forecasting",
+]
+
+async def worker(client, url, queries, deadline, top_k, latencies_ms, errors):
+    """Sends requests back to back until `deadline`, recording each latency."""
+    while time.perf_counter() < deadline:
+        params = {'q': random.choice(queries), 'top_k': top_k}
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            errors.append(str(e))
+            continue
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+async def run_load_test(base_url, queries, concurrency, duration, top_k):
+    """
+    Runs `concurrency` clients against /search for `duration` seconds.
+    Returns throughput, latency percentiles and the server's batching statistics.
+    """
+    latencies_ms, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        before = (await client.get('/health')).json()['batching']
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            worker(client, '/search', queries, deadline, top_k, latencies_ms, errors)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+        after = (await client.get('/health')).json()['batching']
+
+    batches = after['batches'] - before['batches']
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if latencies_ms else (float('nan'),) * 3
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies_ms),
+        'errors': len(errors),
+        'qps': len(latencies_ms) / elapsed,
+        'latency_p50_ms': float(p50),
+        'latency_p95_ms': float(p95),
+        'latency_p99_ms': float(p99),
+        'latency_max_ms': float(max(latencies_ms, default=float('nan'))),
+        'mean_batch_size': (after['queries'] - before['queries']) / batches if batches else 0.0,
+    }
+
+def main(args):
+    queries = DEFAULT_QUERIES
+    if args.queries_file:
+        with open(args.queries_file, encoding='utf-8') as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    results = [
+        asyncio.run(run_load_test(args.url, queries, concurrency, args.duration, args.top_k))
+        for concurrency in args.concurrency
+    ]
+
+    # Display the results
+    header = f"{'clients':>7} {'requests':>9} {'errors':>7} {'QPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'batch':>6}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        print(f"{result['concurrency']:>7} {result['requests']:>9} {result['errors']:>7} {result['qps']:>8.1f} "
+              f"{result['latency_p50_ms']:>8.1f} {result['latency_p95_ms']:>8.1f} {result['latency_p99_ms']:>8.1f} "
+              f"{result['latency_max_ms']:>8.1f} {result['mean_batch_size']:>6.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'url': args.url, 'duration': args.duration, 'results': results}, f, indent=2)
+        logging.info(f"Results saved at: {args.output}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # httpx logs every request at INFO
+    parser = argparse.ArgumentParser(description="Load-test the search API and report QPS and tail latency.")
+    parser.add_argument("--url", type=str, default="http://127.0.0.1:8000", help="Base URL of a running search_api.py.")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 8, 32], help="Concurrent client counts to test.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level.")
+    parser.add_argument("--top_k", type=int, default=10, help="Results requested per query.")
+    parser.add_argument("--queries_file", type=str, default=None, help="Optional file with one query per line.")
+    parser.add_argument("--output", type=str, default=None, help="Optional path to save the results as JSON.")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,178 @@
+import argparse
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from search_queries import CourseSearcher
+
+# Default cross-encoder: a small MS MARCO model that runs comfortably on CPU
+RERANK_MODEL_NAME = 'cross-encoder/ms-marco-MiniLM-L-6-v2'
+
+# First-stage hits re-scored per query, and the time the stage may add to a query
+RERANK_CANDIDATES = 20
+LATENCY_BUDGET_MS = 150.0
+
+# Number of recent queries used for the added-latency report
+LATENCY_WINDOW = 200
+
+# Cross-encoders are expensive to load, so keep one instance per model name for the whole process
+_cross_encoders = {}
+_cross_encoders_lock = threading.Lock()
+
+def get_cross_encoder(model_name=RERANK_MODEL_NAME):
+    """Return the process-wide CrossEncoder for `model_name`, loading it on first use."""
+    model = _cross_encoders.get(model_name)
+    if model is None:
+        with _cross_encoders_lock:
+            model = _cross_encoders.get(model_name)
+            if model is None:
+                from sentence_transformers import CrossEncoder
+                print(f"Loading cross-encoder {model_name}...")
+                model = CrossEncoder(model_name)
+                _cross_encoders[model_name] = model
+    return model
+
+
+class CrossEncoderReranker:
+    """
+    Second-stage re-ranking of search hits with a cross-encoder, which reads the
+    query and course text together and ranks more precisely than embeddings.
+    Uncached (query, course id) pairs are scored in batched forward passes and
+    their scores kept in a bounded LRU cache. The stage has a latency budget:
+    when scoring would exceed it, the first-stage order is kept (scores computed
+    so far are still cached, so a repeated query can be re-ranked next time).
+    """
+
+    def __init__(self, model_name=RERANK_MODEL_NAME, candidates=RERANK_CANDIDATES, budget_ms=LATENCY_BUDGET_MS,
+                 batch_size=32, cache_size=4096):
+        self.model_name = model_name
+        self.candidates = candidates
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._ms_per_pair = None  # Running estimate of the forward-pass cost
+        self._latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def model(self):
+        return get_cross_encoder(self.model_name)
+
+    def _cached_scores(self, query, course_ids):
+        with self._cache_lock:
+            scores = {}
+            for course_id in course_ids:
+                score = self._cache.get((query, course_id))
+                if score is not None:
+                    self._cache.move_to_end((query, course_id))
+                    scores[course_id] = score
+            return scores
+
+    def _store_scores(self, query, scores):
+        with self._cache_lock:
+            for course_id, score in scores.items():
+                self._cache[(query, course_id)] = score
+                self._cache.move_to_end((query, course_id))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _score(self, query, course_ids, texts, deadline):
+        """
+        Score (query, text) pairs batch by batch until `deadline`. Returns the new
+        scores and whether every pair was scored; a last batch finishing after the
+        deadline still counts, since its scores are all there.
+        """
+        model = self.model  # Loaded before timing, so a cold start does not skew the estimate
+        scores = {}
+        for i in range(0, len(course_ids), self.batch_size):
+            batch_ids = course_ids[i:i + self.batch_size]
+            if self._ms_per_pair is not None and time.perf_counter() + self._ms_per_pair * len(batch_ids) / 1000 > deadline:
+                return scores, False
+
+            start = time.perf_counter()
+            batch_scores = model.predict([(query, texts[course_id]) for course_id in batch_ids],
+                                         batch_size=self.batch_size, show_progress_bar=False)
+            ms_per_pair = (time.perf_counter() - start) * 1000 / len(batch_ids)
+            self._ms_per_pair = ms_per_pair if self._ms_per_pair is None else 0.8 * self._ms_per_pair + 0.2 * ms_per_pair
+            scores.update(zip(batch_ids, np.asarray(batch_scores, dtype='float64').tolist()))
+
+            # Past the deadline only matters if candidates are left unscored
+            if len(scores) < len(course_ids) and time.perf_counter() > deadline:
+                return scores, False
+        return scores, True
+
+    def rerank(self, query, hits, texts):
+        """
+        Re-rank the first `candidates` of `hits` (dicts with a `course_id`, best
+        first); `texts` holds the course text for each hit. Returns (hits, stats):
+        re-ranked hits gain a `rerank_score`, hits beyond the candidates keep their
+        place after them. `stats` reports the added latency in milliseconds, how
+        many pairs came from the cache or were scored, and whether the budget
+        forced a fallback to first-stage order.
+        """
+        start = time.perf_counter()
+        head, tail = hits[:self.candidates], hits[self.candidates:]
+        course_ids = [hit['course_id'] for hit in head]
+        texts_by_id = dict(zip(course_ids, texts[:self.candidates]))
+
+        scores = self._cached_scores(query, course_ids)
+        cached = len(scores)
+        missing = [course_id for course_id in dict.fromkeys(course_ids) if course_id not in scores]
+        complete = True
+        if missing:
+            new_scores, complete = self._score(query, missing, texts_by_id, start + self.budget_ms / 1000)
+            self._store_scores(query, new_scores)
+            scores.update(new_scores)
+
+        if complete:
+            # Stable sort: equal scores keep their first-stage order
+            order = sorted(range(len(head)), key=lambda i: -scores[course_ids[i]])
+            head = [{**head[i], 'rerank_score': scores[course_ids[i]]} for i in order]
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._latencies_ms.append(elapsed_ms)
+        stats = {
+            'rerank_ms': elapsed_ms,
+            'cached': cached,
+            'scored': len(scores) - cached,
+            'fallback': not complete,
+        }
+        return head + tail, stats
+
+    def latency_percentiles(self):
+        """Returns (p50, p95) of the added latency in milliseconds over recent queries, or None."""
+        if not self._latencies_ms:
+            return None
+        p50, p95 = np.percentile(list(self._latencies_ms), [50, 95])
+        return p50, p95
+
+
+# Compare first-stage and re-ranked results and report the added latency per query
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search courses with cross-encoder re-ranking.")
+    parser.add_argument("queries", nargs='*', default=["data analysis with Python", "introduction to generative AI"],
+                        help="Queries to search.")
+    parser.add_argument("--top_k", type=int, default=5, help="Number of results per query.")
+    parser.add_argument("--candidates", type=int, default=RERANK_CANDIDATES, help="First-stage hits to re-rank.")
+    parser.add_argument("--budget_ms", type=float, default=LATENCY_BUDGET_MS, help="Latency budget of the re-ranking stage.")
+    parser.add_argument("--model_name", type=str, default=RERANK_MODEL_NAME, help="Cross-encoder model name or path.")
+    args = parser.parse_args()
+
+    searcher = CourseSearcher()
+    reranker = CrossEncoderReranker(args.model_name, args.candidates, args.budget_ms)
+
+    for query in args.queries:
+        hits = searcher.search(query, top_k=args.candidates)
+        reranked, stats = searcher.search(query, top_k=args.candidates, reranker=reranker, return_stats=True)
+        status = "fell back to first-stage order" if stats['fallback'] else "re-ranked"
+        print(f"Top {args.top_k} courses for: {query} ({status}; +{stats['rerank_ms']:.1f} ms, "
+              f"{stats['scored']} scored, {stats['cached']} cached)")
+        for i, (first, second) in enumerate(zip(hits[:args.top_k], reranked[:args.top_k])):
+            print(f"{i+1}. {second['course_title']}  (first stage: {first['course_title']})")
+
+    percentiles = reranker.latency_percentiles()
+    if percentiles:
+        print(f"Added latency: p50={percentiles[0]:.1f} ms, p95={percentiles[1]:.1f} ms")
@@ -1,223 +1,912 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import re
-import os
-
-# Base URL of Analytics Vidhya's free courses page
-BASE_URL = "https://courses.analyticsvidhya.com/collections/courses"
-
-# Function to extract course rating from a soup object
-def extract_rating(soup):
-    """Extract course rating."""
-    rating_match = re.search(r'(\d\.\d)/5', soup.get_text())
-    return rating_match.group(1) if rating_match else 'N/A'
-
-# Function to extract course level from a soup object
-def extract_level(soup):
-    """Extract course level."""
-    levels = ["Beginner", "Intermediate", "Advanced"]
-    for level in levels:
-        if soup.find(string=re.compile(level, re.IGNORECASE)):
-            return level
-    return 'N/A'
-
-# Function to extract course curriculum from a soup object
-def extract_curriculum(soup):
-    """Extract course curriculum/topics."""
-    # Find the section containing the course chapters
-    curriculum_section = soup.find('ul', class_='course-curriculum__chapter-list')
-    if not curriculum_section:
-        return 'N/A'
-
-    # Initialize an empty list to store curriculum content
-    curriculum = []
-
-    # Loop through each chapter
-    chapters = curriculum_section.find_all('li', class_='course-curriculum__chapter')
-    for chapter in chapters:
-        chapter_title = chapter.find('h5', class_='course-curriculum__chapter-title')
-        if chapter_title:
-            curriculum.append(chapter_title.get_text(strip=True))  # Add chapter title
-
-        # Extract lesson titles within the chapter
-        lessons = chapter.find_all('span', class_='course-curriculum__chapter-lesson')
-        for lesson in lessons:
-            lesson_title = lesson.get_text(strip=True)
-            if lesson_title:
-                curriculum.append(lesson_title)  # Add lesson title
-
-    # Join all curriculum topics with commas, and return the result
-    return ', '.join(curriculum) if curriculum else 'N/A'
-
-# Function to parse an individual course page
-def parse_course_page(course_url):
-    """Fetch and parse details from an individual course page."""
-    response = requests.get(course_url)
-    if response.status_code != 200:
-        print(f"Failed to fetch course page: {course_url}")
-        return {
-            'course_description': 'N/A',
-            'course_duration': 'N/A',
-            'course_rating': 'N/A',
-            'course_level': 'N/A',
-            'instructor_name': 'N/A',
-            'who_should_enroll': 'N/A',
-            'course_curriculum': 'N/A'  # Add the curriculum here
-        }
-
-    response.encoding = 'utf-8'
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-    # Extract course description
-    course_description = soup.find('section', class_='section__body')
-    course_description = course_description.get_text(strip=True) if course_description else 'N/A'
-
-    # Extract course duration
-    duration_tag = soup.find('h4', text=re.compile(r'^\d+\s\w+', re.IGNORECASE))
-    course_duration = duration_tag.get_text(strip=True) if duration_tag else 'N/A'
-
-    # Extract course rating
-    course_rating = extract_rating(soup)
-
-    # Extract course level
-    course_level = extract_level(soup)
-
-    # Extract instructor name
-    instructor_tag = soup.find('h4', class_='section__subheading')
-    instructor_name = instructor_tag.get_text(strip=True) if instructor_tag else 'N/A'
-
-    # Extract "Who Should Enroll" section
-    who_should_enroll = 'N/A'
-    enroll_heading = soup.find('h3', string=re.compile(r'Who Should Enroll', re.IGNORECASE))
-    if enroll_heading:
-        enroll_section = enroll_heading.find_next('ul')
-        if enroll_section:
-            enroll_items = enroll_section.find_all('li')
-            who_should_enroll = ', '.join(item.get_text(strip=True) for item in enroll_items) if enroll_items else 'N/A'
-
-    # Extract course curriculum
-    course_curriculum = extract_curriculum(soup)
-
-    return {
-        'course_description': course_description,
-        'course_duration': course_duration,
-        'course_rating': course_rating,
-        'course_level': course_level,
-        'instructor_name': instructor_name,
-        'who_should_enroll': who_should_enroll,
-        'course_curriculum': course_curriculum  # Add curriculum in the return data
-    }
-
-# Function to extract course data from a single page
-def get_course_data(page_url):
-    response = requests.get(page_url)
-    if response.status_code != 200:
-        print(f"Failed to fetch page: {page_url}")
-        return []
-
-    response.encoding = 'utf-8'
-    soup = BeautifulSoup(response.text, 'html.parser')
-    course_items = soup.find_all('li', class_='products__list-item')
-    courses = []
-
-    for item in course_items:
-        course_data = {}
-
-        # Extract course title
-        title_tag = item.find('h3')
-        course_data['course_title'] = title_tag.get_text(strip=True) if title_tag else 'N/A'
-
-        # Extract course URL
-        url_tag = item.find('a', class_='course-card')
-        relative_url = url_tag['href'] if url_tag else 'N/A'
-        course_data['course_url'] = (
-            relative_url if relative_url.startswith('http')
-            else 'https://courses.analyticsvidhya.com' + relative_url
-        ) if relative_url != 'N/A' else 'N/A'
-
-        # Extract lesson count
-        lesson_count_tag = item.find('span', class_='course-card__lesson-count')
-        lesson_count = lesson_count_tag.get_text(strip=True) if lesson_count_tag else 'N/A'
-        course_data['lesson_count'] = int(re.search(r'\d+', lesson_count).group()) if re.search(r'\d+', lesson_count) else 0
-
-        # Extract price
-        price_tag = item.find('span', class_='course-card__price')
-        course_data['price'] = price_tag.get_text(strip=True) if price_tag else 'Free'
-
-        # Extract reviews
-        reviews_tag = item.find('span', class_='review__stars-count')
-        reviews = reviews_tag.get_text(strip=True) if reviews_tag else 'No reviews'
-        course_data['reviews'] = (
-            int(re.search(r'-?\d+', reviews).group()) if re.search(r'-?\d+', reviews) else 'No reviews'
-        )
-        if isinstance(course_data['reviews'], int) and course_data['reviews'] < 0:
-            course_data['reviews'] = abs(course_data['reviews'])
-
-        # Fetch additional details from the course page
-        if course_data['course_url'] != 'N/A':
-            detailed_data = parse_course_page(course_data['course_url'])
-            course_data.update(detailed_data)
-
-        courses.append(course_data)
-
-    return courses
-
-# Function to save cleaned data to CSV with the correct column order
-def save_to_csv(courses, filename="courses_data11.csv"):
-    # Specify the improved column order
-    column_order = [
-        'course_title',
-        'course_url',
-        'course_description',
-        'course_curriculum',
-        'course_level',
-        'course_rating',
-        'lesson_count',
-        'price',
-        'reviews',
-        'course_duration',
-        'instructor_name',
-        'who_should_enroll'  # Ensure this is at the end as it's more descriptive
-    ]
-    
-    # Ensure the data directory exists
-    output_file = os.path.join("data", filename)  # Save to 'data' folder
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    
-    # Create a DataFrame from the courses data
-    df = pd.DataFrame(courses)
-    
-    # Ensure the DataFrame has the correct column order
-    df = df[column_order]
-    
-    # Save the DataFrame to the specified location
-    df.to_csv(output_file, index=False, encoding='utf-8')
-    print(f"Data saved to {output_file}")
-
-
-# Main function to scrape all courses across multiple pages
-def scrape_all_courses():
-    all_courses = []
-    current_page = 1
-    while True:
-        page_url = f"{BASE_URL}?page={current_page}"
-        print(f"Scraping page {current_page}...")
-        courses = get_course_data(page_url)
-        
-        # If no courses are found on this page, break the loop (end of pagination)
-        if not courses:
-            print(f"No courses found on page {current_page}. Ending the scraping process.")
-            break
-        
-        all_courses.extend(courses)
-        current_page += 1  # Move to the next page
-
-    return all_courses
-
-
-# Main execution
-if __name__ == "__main__":
-    print("Starting the scraping process...")
-    courses = scrape_all_courses()
-    save_to_csv(courses)
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+import pandas as pd
+import argparse
+import hashlib
+import json
+import threading
+import time
+import re
+import os
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # Fall back to BeautifulSoup's html.parser
+    lxml = None
+
+# Base URL of Analytics Vidhya's free courses page
+BASE_URL = "https://courses.analyticsvidhya.com/collections/courses"
+
+# Network defaults for the scraper
+REQUEST_TIMEOUT = 15  # Seconds to wait for a connection or a response
+MAX_RETRIES = 3  # Retries for connection errors and 429/5xx responses
+BACKOFF_FACTOR = 0.5  # Exponential backoff between retries: 0.5s, 1s, 2s, ...
+MAX_WORKERS = 8  # Course detail pages fetched in parallel
+MAX_PENDING_PARSES = 32  # Fetched pages allowed to wait for a parse worker
+REQUESTS_PER_SECOND = 10  # Per-host rate limit
+
+# HTML parsing backends for course detail pages
+PARSERS = ('lxml', 'html.parser')
+DEFAULT_PARSER = 'lxml' if lxml is not None else 'html.parser'
+
+# On-disk cache of fetched pages used for conditional re-scrapes
+PAGE_CACHE_DIR = os.path.join("data", "page_cache")
+
+# Version of what the page parsers extract. Cached parse results are only reused
+# when they were produced by this version; bump it whenever parse_listing_page or
+# the course page parsers change their output.
+PARSER_VERSION = 1
+
+# A fetched page. `changed` is False when the server answered 304 or the body hash
+# matched the cached copy; `parsed` then holds the result of the previous parse, if any.
+Page = namedtuple('Page', ['url', 'status_code', 'text', 'changed', 'parsed'])
+
+
+class HostRateLimiter:
+    """Space out requests so at most `rate` requests per second start against each host."""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).hostname
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimitedRetry(Retry):
+    """
+    Retry policy that also takes a rate-limit slot before every retry. urllib3
+    retries inside session.get(), so without this only the first attempt of a
+    request would wait for the limiter and retry bursts would not be spaced out.
+    """
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.host_url = None
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def increment(self, method=None, url=None, *args, _pool=None, **kwargs):
+        retry = super().increment(method, url, *args, _pool=_pool, **kwargs)
+        if _pool is not None:
+            retry.host_url = f"{_pool.scheme}://{_pool.host}"
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)  # Backoff or Retry-After
+        if self.rate_limiter is not None and self.host_url is not None:
+            self.rate_limiter.wait(self.host_url)
+
+
+def create_session(pool_size=MAX_WORKERS, retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, rate_limiter=None):
+    """
+    Create a requests.Session with a connection pool sized for the workers and automatic retries.
+    With a `rate_limiter`, every retry waits for its slot like the first attempt does.
+    """
+    retry = RateLimitedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Give the final response back instead of raising
+        rate_limiter=rate_limiter,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class PageCache:
+    """
+    On-disk page cache keyed by URL: one JSON file per page holding the body,
+    its ETag/Last-Modified validators, a content hash and the last parse result
+    with the PARSER_VERSION that produced it.
+    """
+
+    def __init__(self, directory=PAGE_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, entry):
+        # Write to a temporary file first so a crash never leaves a truncated entry
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def set_parsed(self, url, parsed):
+        entry = self.get(url)
+        if entry is not None:
+            entry['parsed'] = parsed
+            entry['parser_version'] = PARSER_VERSION
+            self.put(url, entry)
+
+    @staticmethod
+    def cached_parse(entry):
+        """The parse result stored in `entry`, or None if there is none or an older parser produced it."""
+        if entry is None or entry.get('parser_version') != PARSER_VERSION:
+            return None
+        return entry.get('parsed')
+
+
+class Fetcher:
+    """
+    Pooled, rate-limited HTTP client shared by all scraping workers.
+    With a PageCache it sends conditional GETs and reports unchanged pages.
+    """
+
+    def __init__(self, session=None, rate_limiter=None, timeout=REQUEST_TIMEOUT, cache=None):
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.session = session or create_session(rate_limiter=self.rate_limiter)
+        self.timeout = timeout
+        self.cache = cache
+
+    def get(self, url):
+        """GET `url` and return a Page, or None if it could not be fetched."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        self.rate_limiter.wait(url)
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        except requests.RequestException as e:
+            print(f"Request failed for {url}: {e}")
+            return None
+
+        if response.status_code == 304 and entry is not None:
+            return Page(url, 200, entry['body'], False, self.cache.cached_parse(entry))
+
+        response.encoding = 'utf-8'
+        if response.status_code != 200 or self.cache is None:
+            return Page(url, response.status_code, response.text, True, None)
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        unchanged = entry is not None and entry.get('content_hash') == content_hash
+        parsed = self.cache.cached_parse(entry) if unchanged else None
+        self.cache.put(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash,
+            'body': response.text,
+            'parsed': parsed,
+            'parser_version': PARSER_VERSION if parsed is not None else None,
+        })
+        return Page(url, 200, response.text, not unchanged, parsed)
+
+    def store_parsed(self, url, parsed):
+        """Remember the parse result of `url` so an unchanged page is not parsed again."""
+        if self.cache is not None:
+            self.cache.set_parsed(url, parsed)
+
+
+class ReplayFetcher:
+    """
+    Serves pages recorded in a PageCache without touching the network, for
+    offline runs and tests. Every recorded page is parsed again; pages that
+    were never recorded answer 404.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, url):
+        entry = self.cache.get(url)
+        if entry is None:
+            return Page(url, 404, '', True, None)
+        return Page(url, 200, entry['body'], True, None)
+
+    def store_parsed(self, url, parsed):
+        pass
+
+
+# Fetcher used when callers do not pass their own
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+def get_default_fetcher():
+    """Return the process-wide Fetcher, creating it on first use."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher()
+    return _default_fetcher
+
+# Function to extract course rating from a soup object
+def extract_rating(soup):
+    """Extract course rating."""
+    rating_match = re.search(r'(\d\.\d)/5', soup.get_text())
+    return rating_match.group(1) if rating_match else 'N/A'
+
+# Function to extract course level from a soup object
+def extract_level(soup):
+    """Extract course level."""
+    levels = ["Beginner", "Intermediate", "Advanced"]
+    for level in levels:
+        if soup.find(string=re.compile(level, re.IGNORECASE)):
+            return level
+    return 'N/A'
+
+# Function to extract course curriculum from a soup object
+def extract_curriculum(soup):
+    """Extract course curriculum/topics."""
+    # Find the section containing the course chapters
+    curriculum_section = soup.find('ul', class_='course-curriculum__chapter-list')
+    if not curriculum_section:
+        return 'N/A'
+
+    # Initialize an empty list to store curriculum content
+    curriculum = []
+
+    # Loop through each chapter
+    chapters = curriculum_section.find_all('li', class_='course-curriculum__chapter')
+    for chapter in chapters:
+        chapter_title = chapter.find('h5', class_='course-curriculum__chapter-title')
+        if chapter_title:
+            curriculum.append(chapter_title.get_text(strip=True))  # Add chapter title
+
+        # Extract lesson titles within the chapter
+        lessons = chapter.find_all('span', class_='course-curriculum__chapter-lesson')
+        for lesson in lessons:
+            lesson_title = lesson.get_text(strip=True)
+            if lesson_title:
+                curriculum.append(lesson_title)  # Add lesson title
+
+    # Join all curriculum topics with commas, and return the result
+    return ', '.join(curriculum) if curriculum else 'N/A'
+
+# Details of a course whose page could not be fetched
+MISSING_DETAILS = {
+    'course_description': 'N/A',
+    'course_duration': 'N/A',
+    'course_rating': 'N/A',
+    'course_level': 'N/A',
+    'instructor_name': 'N/A',
+    'who_should_enroll': 'N/A',
+    'course_curriculum': 'N/A',
+}
+
+# Function to parse an individual course page
+def parse_course_page(course_url, fetcher=None, parser=None):
+    """Fetch and parse details from an individual course page."""
+    fetcher = fetcher or get_default_fetcher()
+    response = fetcher.get(course_url)
+    if response is not None and response.parsed is not None:
+        return dict(response.parsed)  # Page unchanged since the last scrape
+    if response is None or response.status_code != 200:
+        print(f"Failed to fetch course page: {course_url}")
+        return dict(MISSING_DETAILS)
+
+    details = parse_course_html(response.text, parser)
+    fetcher.store_parsed(course_url, details)
+    return details
+
+# Function to extract the details of a course page with the chosen backend
+def parse_course_html(html, parser=None):
+    """
+    Extract the details of a course page from its HTML. `parser` is 'lxml'
+    (precompiled XPath, the default when lxml is installed) or 'html.parser'
+    (BeautifulSoup); both return the same fields.
+    """
+    parser = parser or DEFAULT_PARSER
+    if parser == 'lxml':
+        if lxml is None:
+            raise ImportError("The lxml parser needs the lxml package")
+        return parse_course_html_lxml(html)
+    if parser == 'html.parser':
+        return parse_course_html_soup(html)
+    raise ValueError(f"Unknown parser: {parser}")
+
+# Function to extract the details of a course page with BeautifulSoup
+def parse_course_html_soup(html):
+    """Extract course details with a full BeautifulSoup tree."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract course description
+    course_description = soup.find('section', class_='section__body')
+    course_description = course_description.get_text(strip=True) if course_description else 'N/A'
+
+    # Extract course duration
+    duration_tag = soup.find('h4', text=re.compile(r'^\d+\s\w+', re.IGNORECASE))
+    course_duration = duration_tag.get_text(strip=True) if duration_tag else 'N/A'
+
+    # Extract course rating
+    course_rating = extract_rating(soup)
+
+    # Extract course level
+    course_level = extract_level(soup)
+
+    # Extract instructor name
+    instructor_tag = soup.find('h4', class_='section__subheading')
+    instructor_name = instructor_tag.get_text(strip=True) if instructor_tag else 'N/A'
+
+    # Extract "Who Should Enroll" section
+    who_should_enroll = 'N/A'
+    enroll_heading = soup.find('h3', string=re.compile(r'Who Should Enroll', re.IGNORECASE))
+    if enroll_heading:
+        enroll_section = enroll_heading.find_next('ul')
+        if enroll_section:
+            enroll_items = enroll_section.find_all('li')
+            who_should_enroll = ', '.join(item.get_text(strip=True) for item in enroll_items) if enroll_items else 'N/A'
+
+    # Extract course curriculum
+    course_curriculum = extract_curriculum(soup)
+
+    details = {
+        'course_description': course_description,
+        'course_duration': course_duration,
+        'course_rating': course_rating,
+        'course_level': course_level,
+        'instructor_name': instructor_name,
+        'who_should_enroll': who_should_enroll,
+        'course_curriculum': course_curriculum  # Add curriculum in the return data
+    }
+    return details
+
+# Precompiled selectors and patterns for the lxml backend
+def _has_class(name):
+    """XPath predicate matching elements with CSS class `name`, like BeautifulSoup's class_."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+if lxml is not None:
+    _LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+    # Text get_text() sees (it skips script, style and template contents) and the
+    # rest of the strings find(string=...) also searches
+    _XP_VISIBLE_TEXT = etree.XPath('//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+    _XP_HIDDEN_TEXT = etree.XPath('//script//text() | //style//text() | //template//text() | //comment()')
+    _XP_DESCRIPTION = etree.XPath(f"//section[{_has_class('section__body')}]")
+    _XP_H4 = etree.XPath('//h4')
+    _XP_INSTRUCTOR = etree.XPath(f"//h4[{_has_class('section__subheading')}]")
+    _XP_H3 = etree.XPath('//h3')
+    _XP_NEXT_UL = etree.XPath('descendant::ul | following::ul')
+    _XP_LI = etree.XPath('.//li')
+    _XP_CURRICULUM = etree.XPath(f"//ul[{_has_class('course-curriculum__chapter-list')}]")
+    _XP_CHAPTERS = etree.XPath(f".//li[{_has_class('course-curriculum__chapter')}]")
+    _XP_CHAPTER_TITLE = etree.XPath(f".//h5[{_has_class('course-curriculum__chapter-title')}]")
+    _XP_LESSONS = etree.XPath(f".//span[{_has_class('course-curriculum__chapter-lesson')}]")
+    _XP_VISIBLE_DESCENDANT_TEXT = etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+
+RATING_PATTERN = re.compile(r'(\d\.\d)/5')
+LEVEL_PATTERN = re.compile(r'Beginner|Intermediate|Advanced', re.IGNORECASE)
+DURATION_PATTERN = re.compile(r'^\d+\s\w+', re.IGNORECASE)
+ENROLL_PATTERN = re.compile(r'Who Should Enroll', re.IGNORECASE)
+
+def _lxml_text(element):
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return ''.join(text.strip() for text in _XP_VISIBLE_DESCENDANT_TEXT(element))
+
+def _lxml_string(element):
+    """Equivalent of BeautifulSoup's .string: the element's only string, or None."""
+    children = [element.text] if element.text else []
+    for child in element:
+        children.append(child)
+        if child.tail:
+            children.append(child.tail)
+    if len(children) != 1:
+        return None
+    child = children[0]
+    if isinstance(child, str):
+        return child
+    if not isinstance(child.tag, str):  # A comment
+        return child.text
+    return _lxml_string(child)
+
+def parse_course_html_lxml(html):
+    """
+    Extract course details with lxml. Rating and level come from one regex scan
+    each over the document's strings, and sections are found with precompiled
+    XPath selectors instead of Python-level tree searches.
+    """
+    root = lxml.html.document_fromstring(html.encode('utf-8'), parser=_LXML_PARSER)
+
+    # Extract course description
+    description = _XP_DESCRIPTION(root)
+    course_description = _lxml_text(description[0]) if description else 'N/A'
+
+    # Extract course duration
+    course_duration = 'N/A'
+    for h4 in _XP_H4(root):
+        string = _lxml_string(h4)
+        if string is not None and DURATION_PATTERN.search(string):
+            course_duration = _lxml_text(h4)
+            break
+
+    # Extract course rating from the visible text
+    visible_text = _XP_VISIBLE_TEXT(root)
+    rating_match = RATING_PATTERN.search(''.join(visible_text))
+    course_rating = rating_match.group(1) if rating_match else 'N/A'
+
+    # Extract course level: the first of Beginner, Intermediate, Advanced found in any string
+    strings = visible_text + [node if isinstance(node, str) else node.text or '' for node in _XP_HIDDEN_TEXT(root)]
+    found = {match.lower() for match in LEVEL_PATTERN.findall('\x00'.join(strings))}
+    course_level = next((level for level in ["Beginner", "Intermediate", "Advanced"] if level.lower() in found), 'N/A')
+
+    # Extract instructor name
+    instructor = _XP_INSTRUCTOR(root)
+    instructor_name = _lxml_text(instructor[0]) if instructor else 'N/A'
+
+    # Extract "Who Should Enroll" section
+    who_should_enroll = 'N/A'
+    for h3 in _XP_H3(root):
+        string = _lxml_string(h3)
+        if string is not None and ENROLL_PATTERN.search(string):
+            enroll_section = _XP_NEXT_UL(h3)
+            if enroll_section:
+                enroll_items = _XP_LI(enroll_section[0])
+                who_should_enroll = ', '.join(_lxml_text(item) for item in enroll_items) if enroll_items else 'N/A'
+            break
+
+    # Extract course curriculum
+    course_curriculum = 'N/A'
+    curriculum_section = _XP_CURRICULUM(root)
+    if curriculum_section:
+        curriculum = []
+        for chapter in _XP_CHAPTERS(curriculum_section[0]):
+            chapter_title = _XP_CHAPTER_TITLE(chapter)
+            if chapter_title:
+                curriculum.append(_lxml_text(chapter_title[0]))
+            curriculum.extend(title for title in (_lxml_text(lesson) for lesson in _XP_LESSONS(chapter)) if title)
+        course_curriculum = ', '.join(curriculum) if curriculum else 'N/A'
+
+    return {
+        'course_description': course_description,
+        'course_duration': course_duration,
+        'course_rating': course_rating,
+        'course_level': course_level,
+        'instructor_name': instructor_name,
+        'who_should_enroll': who_should_enroll,
+        'course_curriculum': course_curriculum,
+    }
+
+# Function to extract the course cards listed on a single page
+def parse_listing_page(html, page_url):
+    """Extract title, URL, lesson count, price and reviews for every course card on a listing page."""
+    soup = BeautifulSoup(html, 'html.parser')
+    course_items = soup.find_all('li', class_='products__list-item')
+    courses = []
+
+    for item in course_items:
+        course_data = {}
+
+        # Extract course title
+        title_tag = item.find('h3')
+        course_data['course_title'] = title_tag.get_text(strip=True) if title_tag else 'N/A'
+
+        # Extract course URL
+        url_tag = item.find('a', class_='course-card')
+        relative_url = url_tag['href'] if url_tag else 'N/A'
+        course_data['course_url'] = urljoin(page_url, relative_url) if relative_url != 'N/A' else 'N/A'
+
+        # Extract lesson count
+        lesson_count_tag = item.find('span', class_='course-card__lesson-count')
+        lesson_count = lesson_count_tag.get_text(strip=True) if lesson_count_tag else 'N/A'
+        course_data['lesson_count'] = int(re.search(r'\d+', lesson_count).group()) if re.search(r'\d+', lesson_count) else 0
+
+        # Extract price
+        price_tag = item.find('span', class_='course-card__price')
+        course_data['price'] = price_tag.get_text(strip=True) if price_tag else 'Free'
+
+        # Extract reviews
+        reviews_tag = item.find('span', class_='review__stars-count')
+        reviews = reviews_tag.get_text(strip=True) if reviews_tag else 'No reviews'
+        course_data['reviews'] = (
+            int(re.search(r'-?\d+', reviews).group()) if re.search(r'-?\d+', reviews) else 'No reviews'
+        )
+        if isinstance(course_data['reviews'], int) and course_data['reviews'] < 0:
+            course_data['reviews'] = abs(course_data['reviews'])
+
+        courses.append(course_data)
+
+    return courses
+
+class ParsePipeline:
+    """
+    Two-stage course page pipeline: I/O threads fetch raw HTML and a pool of
+    processes parses it, so parsing uses every core instead of competing for
+    the GIL with the fetch threads. At most `max_pending` fetched pages wait
+    for a parse worker; beyond that the fetch threads block (backpressure),
+    which also bounds the HTML held in memory.
+    """
+
+    def __init__(self, fetcher, fetch_workers=MAX_WORKERS, parse_workers=None, parser=None,
+                 max_pending=MAX_PENDING_PARSES):
+        self.fetcher = fetcher
+        self.parser = parser or DEFAULT_PARSER
+        self._fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="fetch")
+        self._parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _fetch(self, url):
+        """Stage 1, on an I/O thread: fetch a page and queue its HTML for parsing."""
+        response = self.fetcher.get(url)
+        if response is not None and response.parsed is not None:
+            return dict(response.parsed)  # Page unchanged since the last scrape
+        if response is None or response.status_code != 200:
+            print(f"Failed to fetch course page: {url}")
+            return dict(MISSING_DETAILS)
+
+        self._slots.acquire()  # Wait while `max_pending` pages are queued for parsing
+        try:
+            future = self._parse_pool.submit(parse_course_html, response.text, self.parser)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def parse_course_pages(self, urls):
+        """Fetch and parse the course pages at `urls`; returns their details in order."""
+        fetches = [self._fetch_pool.submit(self._fetch, url) for url in urls]
+        details = []
+        for url, fetch in zip(urls, fetches):
+            result = fetch.result()
+            if isinstance(result, Future):
+                result = result.result()  # Stage 2: the parse worker's result
+                self.fetcher.store_parsed(url, result)
+            details.append(result)
+        return details
+
+    def close(self):
+        self._fetch_pool.shutdown(cancel_futures=True)
+        self._parse_pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Function to extract course data from a single page
+def get_course_data(page_url, fetcher=None, executor=None, parser=None, pipeline=None):
+    """
+    Parse one listing page and fetch the detail page of every course on it.
+    Detail pages are fetched concurrently when an executor is given, and parsed
+    in worker processes when a ParsePipeline is given.
+    """
+    fetcher = fetcher or get_default_fetcher()
+    response = fetcher.get(page_url)
+    if response is None or response.status_code != 200:
+        print(f"Failed to fetch page: {page_url}")
+        return []
+
+    if response.parsed is not None:
+        courses = response.parsed  # Listing unchanged since the last scrape
+    else:
+        courses = parse_listing_page(response.text, page_url)
+        fetcher.store_parsed(page_url, courses)
+
+    # Fetch additional details from the course pages
+    detailed_courses = [course for course in courses if course['course_url'] != 'N/A']
+    course_urls = [course['course_url'] for course in detailed_courses]
+    if pipeline is not None:
+        details = pipeline.parse_course_pages(course_urls)
+    elif executor is not None:
+        details = executor.map(lambda url: parse_course_page(url, fetcher, parser), course_urls)
+    else:
+        details = (parse_course_page(url, fetcher, parser) for url in course_urls)
+    for course_data, detailed_data in zip(detailed_courses, details):
+        course_data.update(detailed_data)
+
+    return courses
+
+# Improved column order for the saved catalog
+COLUMN_ORDER = [
+    'course_title',
+    'course_url',
+    'course_description',
+    'course_curriculum',
+    'course_level',
+    'course_rating',
+    'lesson_count',
+    'price',
+    'reviews',
+    'course_duration',
+    'instructor_name',
+    'who_should_enroll'  # Ensure this is at the end as it's more descriptive
+]
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items from `iterable`."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Courses converted to CSV rows at a time when saving
+CSV_CHUNK_SIZE = 1000
+
+# Function to save cleaned data to CSV with the correct column order
+def save_to_csv(courses, filename="courses_data11.csv", chunk_size=CSV_CHUNK_SIZE):
+    """
+    Write courses (any iterable, e.g. a shard being read back) to data/`filename`
+    `chunk_size` rows at a time. The file is replaced only once it is complete.
+    """
+    # Ensure the data directory exists
+    output_file = os.path.join("data", filename)  # Save to 'data' folder
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    tmp_file = f"{output_file}.tmp"
+    count = 0
+    with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+        for chunk in batched(courses, chunk_size):
+            # Ensure the DataFrame has the correct column order
+            df = pd.DataFrame(chunk).reindex(columns=COLUMN_ORDER)
+            df.to_csv(f, index=False, header=count == 0)
+            count += len(chunk)
+        if count == 0:
+            pd.DataFrame(columns=COLUMN_ORDER).to_csv(f, index=False)
+    os.replace(tmp_file, output_file)
+    print(f"Data saved to {output_file} ({count} courses)")
+
+
+class CourseShard:
+    """
+    Append-only JSONL file of scraped courses with a checkpoint next to it.
+    Each course is written as soon as it is parsed; after a listing page is
+    complete, the checkpoint records the page number and the shard's byte size
+    at that point. Resuming truncates anything written after the checkpoint
+    (a page interrupted halfway) and continues with the next page.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.checkpoint_path = f"{path}.checkpoint.json"
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.state = None
+        self._file = None
+
+    def load_checkpoint(self):
+        """The last checkpoint as a dict, or None when there is none."""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def open(self, base_url, resume=True):
+        """
+        Open the shard for appending. Returns the page to scrape next: the page
+        after the checkpoint when resuming an unfinished crawl of `base_url`,
+        otherwise 1 with an empty shard.
+        """
+        state = self.load_checkpoint() if resume else None
+        if state is not None and state.get('base_url') != base_url:
+            print(f"Checkpoint is for {state.get('base_url')}; starting a new crawl.")
+            state = None
+        if state is not None and state['complete']:
+            state = None  # The last crawl finished; scrape everything again
+        if state is not None:
+            print(f"Resuming after page {state['last_page']} ({state['courses']} courses saved).")
+
+        self.state = state or {'base_url': base_url, 'last_page': 0, 'courses': 0, 'offset': 0, 'complete': False}
+        self._file = open(self.path, 'a+b')
+        self._file.truncate(self.state['offset'])
+        self._file.seek(0, os.SEEK_END)
+        self._save_checkpoint()
+        return self.state['last_page'] + 1
+
+    def write(self, course):
+        """Append one course."""
+        self._file.write(json.dumps(course, ensure_ascii=False).encode('utf-8') + b'\n')
+
+    def checkpoint(self, page, courses, complete=False):
+        """Record that listing page `page` and its `courses` courses are safely in the shard."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.state.update(last_page=page, courses=self.state['courses'] + courses,
+                          offset=self._file.tell(), complete=complete)
+        self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        # Write to a temporary file first so a crash never leaves a truncated checkpoint
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self):
+        """Read the checkpointed courses back one at a time."""
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+# Function to load the courses saved by a previous scrape, if any
+def load_previous_courses(filename="courses_data11.csv"):
+    """Read a previously saved catalog from data/ as string-valued records, or None if it does not exist."""
+    input_file = os.path.join("data", filename)
+    if not os.path.exists(input_file):
+        return None
+    df = pd.read_csv(input_file, dtype=str, keep_default_na=False, encoding='utf-8')
+    return df.to_dict('records')
+
+# Function to compare a fresh scrape with the previous one
+def diff_courses(previous_courses, courses):
+    """
+    Compare two scrapes by course URL. Returns the 'added' and 'changed' course
+    records and the 'removed' course URLs. Values are compared as strings, the way
+    they round-trip through the CSV.
+    """
+    def normalize(course):
+        return {column: str(course.get(column, '')) for column in COLUMN_ORDER}
+
+    previous = {course['course_url']: normalize(course) for course in previous_courses}
+    changes = {'added': [], 'changed': [], 'removed': []}
+    seen = set()
+    # `courses` is read once, so it can be a shard streamed from disk
+    for course in courses:
+        url = course['course_url']
+        if url in seen:
+            continue
+        seen.add(url)
+        if url not in previous:
+            changes['added'].append(course)
+        elif normalize(course) != previous[url]:
+            changes['changed'].append(course)
+    changes['removed'] = [url for url in previous if url not in seen]
+    return changes
+
+# Function to save the changes found by an incremental scrape
+def save_changes(changes, filename="courses_changes.json"):
+    output_file = os.path.join("data", filename)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(changes, f, indent=2)
+    print(f"Added: {len(changes['added'])}, changed: {len(changes['changed'])}, "
+          f"removed: {len(changes['removed'])} (saved to {output_file})")
+
+
+# Generator over the listing pages, for scraping straight to disk
+def iter_course_pages(base_url=BASE_URL, max_workers=MAX_WORKERS, fetcher=None, start_page=1, parser=None,
+                      parse_workers=0):
+    """
+    Walk the listing pages from `start_page` until an empty one, yielding
+    (page number, courses) as each page is scraped. Course detail pages are
+    fetched with `max_workers` threads over one pooled session (max_workers=1
+    scrapes serially). With `parse_workers`, they are parsed in that many
+    processes. Only one page of courses is held at a time.
+    """
+    if fetcher is None:
+        rate_limiter = HostRateLimiter()
+        fetcher = Fetcher(create_session(pool_size=max_workers, rate_limiter=rate_limiter), rate_limiter)
+    current_page = start_page
+    if parse_workers:
+        pool = ParsePipeline(fetcher, max_workers, parse_workers, parser)
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    with pool:
+        while True:
+            page_url = f"{base_url}?page={current_page}"
+            print(f"Scraping page {current_page}...")
+            if parse_workers:
+                courses = get_course_data(page_url, fetcher, parser=parser, pipeline=pool)
+            else:
+                courses = get_course_data(page_url, fetcher, pool if max_workers > 1 else None, parser)
+
+            # If no courses are found on this page, stop (end of pagination)
+            if not courses:
+                print(f"No courses found on page {current_page}. Ending the scraping process.")
+                return
+
+            yield current_page, courses
+            current_page += 1  # Move to the next page
+
+# Main function to scrape all courses across multiple pages into a shard
+def scrape_to_shard(shard, base_url=BASE_URL, max_workers=MAX_WORKERS, fetcher=None, resume=True, parser=None,
+                    parse_workers=0):
+    """
+    Scrape every listing page into `shard`, writing courses as they arrive and
+    checkpointing after each page. With `resume`, an interrupted crawl of the
+    same `base_url` continues after its last complete page. Returns the shard's
+    checkpoint state.
+    """
+    start_page = shard.open(base_url, resume=resume)
+    last_page = start_page - 1
+    try:
+        pages = iter_course_pages(base_url, max_workers, fetcher, start_page, parser, parse_workers)
+        for last_page, courses in pages:
+            for course in courses:
+                shard.write(course)
+            shard.checkpoint(last_page, len(courses))
+        shard.checkpoint(last_page, 0, complete=True)
+    finally:
+        shard.close()
+    return shard.state
+
+def scrape_all_courses(base_url=BASE_URL, max_workers=MAX_WORKERS, fetcher=None, parser=None, parse_workers=0):
+    """Scrape every listing page and return all courses as a list (held in memory)."""
+    pages = iter_course_pages(base_url, max_workers, fetcher, parser=parser, parse_workers=parse_workers)
+    return [course for _, courses in pages for course in courses]
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Analytics Vidhya courses into a JSONL shard and a CSV file.")
+    parser.add_argument("--base_url", type=str, default=BASE_URL, help="Listing page URL to start from.")
+    parser.add_argument("--output", type=str, default="courses_data11.csv", help="Output file name inside data/.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrent course page fetches (1 = serial).")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="Maximum requests per second per host (0 = unlimited).")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="Request timeout in seconds.")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES, help="Retries with exponential backoff per request.")
+    parser.add_argument("--cache_dir", type=str, default=PAGE_CACHE_DIR, help="Page cache used for conditional re-scrapes.")
+    parser.add_argument("--no_cache", action="store_true", help="Re-download and re-parse every page.")
+    parser.add_argument("--changes", type=str, default="courses_changes.json", help="File inside data/ listing added/changed/removed courses.")
+    parser.add_argument("--shard", type=str, default=None, help="JSONL file inside data/ that courses stream to (default: the output name with .jsonl).")
+    parser.add_argument("--restart", action="store_true", help="Ignore the shard's checkpoint and crawl from the first page.")
+    parser.add_argument("--parser", type=str, choices=PARSERS, default=DEFAULT_PARSER, help="HTML parser for course pages.")
+    parser.add_argument("--parse_workers", type=int, default=0, help="Processes parsing course pages apart from the fetch threads (0 = parse in the fetch threads).")
+    parser.add_argument("--offline", action="store_true", help="Replay the pages recorded in the page cache instead of fetching.")
+    args = parser.parse_args()
+
+    if args.offline:
+        fetcher = ReplayFetcher(PageCache(args.cache_dir))
+    else:
+        rate_limiter = HostRateLimiter(args.rate)
+        fetcher = Fetcher(
+            session=create_session(pool_size=args.workers, retries=args.retries, rate_limiter=rate_limiter),
+            rate_limiter=rate_limiter,
+            timeout=args.timeout,
+            cache=None if args.no_cache else PageCache(args.cache_dir),
+        )
+
+    shard = CourseShard(os.path.join("data", args.shard or os.path.splitext(args.output)[0] + ".jsonl"))
+
+    print("Starting the scraping process...")
+    start = time.perf_counter()
+    state = scrape_to_shard(shard, args.base_url, max_workers=args.workers, fetcher=fetcher,
+                            resume=not args.restart, parser=args.parser, parse_workers=args.parse_workers)
+    print(f"Scraped {state['courses']} courses from {state['last_page']} pages in {time.perf_counter() - start:.1f}s "
+          f"(saved to {shard.path})")
+
+    # Report what changed since the last saved scrape before overwriting it
+    previous_courses = load_previous_courses(args.output)
+    if previous_courses is not None:
+        save_changes(diff_courses(previous_courses, shard), args.changes)
+    save_to_csv(shard, args.output)
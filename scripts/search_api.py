@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from course_store import METADATA_COLUMNS
+from search_queries import CATALOG_PATH  # Also makes app/ importable
+from catalog import load_catalog
+from filters import filter_mask
+from semantic_search import get_hybrid_searcher, get_searcher
+
+# Micro-batching: wait at most this long for more queries before encoding a batch
+BATCH_WINDOW_MS = 5
+MAX_BATCH_SIZE = 64
+
+MAX_TOP_K = 100
+
+# Course id -> row position for the current catalog version, as (version, dict)
+_course_rows = None
+_course_rows_lock = threading.Lock()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces the query embeddings of concurrent requests into one encode call.
+    The first query of a batch opens a short window; every query arriving in it
+    (up to `max_batch_size`) is encoded together on a dedicated model thread.
+    While a batch is encoding the next one fills up, so batches grow with load.
+    """
+
+    def __init__(self, embed, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE):
+        self.embed = embed
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.queries = 0
+        self._pending = []
+        self._timer = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encode")
+
+    async def encode(self, query):
+        """Embedding of `query`, encoded together with the other queries of its window."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._encode_batch(batch))
+
+    async def _encode_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        self.batches += 1
+        self.queries += len(batch)
+        try:
+            vectors = await loop.run_in_executor(self._executor, self.embed, [query for query, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def stats(self):
+        """Number of batches and queries encoded, and the mean batch size."""
+        return {'batches': self.batches, 'queries': self.queries,
+                'mean_batch_size': self.queries / self.batches if self.batches else 0.0}
+
+
+def _json_value(value):
+    """Plain JSON value for a catalog cell; missing values become null."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    return None if pd.isna(value) else value
+
+
+def _course_json(catalog, row, course_id, columns=None, **extra):
+    """One catalog row as JSON; `columns` limits the fields (all by default)."""
+    values = catalog.frame.iloc[row]
+    if columns is not None:
+        values = values[columns]
+    record = {column: _json_value(value) for column, value in values.items()}
+    return {'course_id': int(course_id), **record, **extra}
+
+
+def course_rows(catalog):
+    """
+    Returns the map course id -> row position in `catalog`, using the ids the
+    search index and metadata store use. Only the ids are computed; the FAISS
+    and keyword indexes are not touched. It is rebuilt when the catalog changes.
+    """
+    global _course_rows
+    rows = _course_rows
+    if rows is None or rows[0] != catalog.version:
+        with _course_rows_lock:
+            if _course_rows is None or _course_rows[0] != catalog.version:
+                ids = get_searcher().catalog_ids(catalog.frame)
+                _course_rows = (catalog.version, {course_id: row for row, course_id in enumerate(ids.tolist())})
+            rows = _course_rows
+    return rows[1]
+
+
+def _parse_search_params(params):
+    """Validated search parameters from the query string; raises ValueError on bad input."""
+    query = params.get('q', '').strip()
+    if not query:
+        raise ValueError("Missing query parameter 'q'")
+    top_k = int(params.get('top_k', 10))
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+    filters = {
+        'course_type': params.get('course_type', 'All'),
+        'course_level': params.get('course_level', 'All'),
+        'min_rating': float(params.get('min_rating', 0.0)),
+        'min_duration': int(params.get('min_duration', 0)),
+    }
+    return query, top_k, filters
+
+
+async def search(request):
+    """
+    GET /search?q=...&top_k=10[&course_type=&course_level=&min_rating=&min_duration=]
+    Semantic search with the Home page's sidebar filters applied inside FAISS.
+    Hits carry the metadata columns; /courses/{id} has the full record.
+    Loading a changed catalog and rebuilding the searcher over it run in the
+    thread pool, so they never stall the event loop or the micro-batcher.
+    """
+    start = time.perf_counter()
+    try:
+        query, top_k, filters = _parse_search_params(request.query_params)
+        catalog = await run_in_threadpool(load_catalog, request.app.state.catalog_path)
+        mask = await run_in_threadpool(lambda: filter_mask(catalog.filter_index, **filters))
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+    embedding = await request.app.state.batcher.encode(query)
+    embed_done = time.perf_counter()
+
+    hybrid = await run_in_threadpool(get_hybrid_searcher, catalog)
+    rows, scores = await run_in_threadpool(hybrid.semantic_search, query, top_k, mask, embedding)
+    course_ids = hybrid.searcher.catalog_ids(catalog.frame.iloc[rows])
+    end = time.perf_counter()
+
+    return JSONResponse({
+        'query': query,
+        'results': [
+            _course_json(catalog, row, course_id, METADATA_COLUMNS, score=float(score))
+            for row, course_id, score in zip(rows.tolist(), course_ids.tolist(), scores)
+        ],
+        'timings': {
+            'embed_ms': (embed_done - start) * 1000,
+            'search_ms': (end - embed_done) * 1000,
+            'total_ms': (end - start) * 1000,
+        },
+    })
+
+
+async def course(request):
+    """GET /courses/{id}: every catalog field of one course, by its course id."""
+    catalog = await run_in_threadpool(load_catalog, request.app.state.catalog_path)
+    course_id = request.path_params['course_id']
+    row = (await run_in_threadpool(course_rows, catalog)).get(course_id)
+    if row is None:
+        return JSONResponse({'error': f"Unknown course id: {course_id}"}, status_code=404)
+    return JSONResponse(_course_json(catalog, row, course_id))
+
+
+async def health(request):
+    """GET /health: catalog size and micro-batching statistics."""
+    catalog = await run_in_threadpool(load_catalog, request.app.state.catalog_path)
+    return JSONResponse({'courses': len(catalog.frame), 'batching': request.app.state.batcher.stats()})
+
+
+def create_app(catalog_path=CATALOG_PATH, window_ms=BATCH_WINDOW_MS, max_batch_size=MAX_BATCH_SIZE):
+    """
+    Builds the search service. One process holds one model, index and catalog,
+    shared by every request.
+    """
+    app = Starlette(routes=[
+        Route('/search', search),
+        Route('/courses/{course_id:int}', course),
+        Route('/health', health),
+    ])
+    app.state.catalog_path = catalog_path
+    app.state.batcher = EmbeddingBatcher(get_searcher().embed, window_ms, max_batch_size)
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve course search over HTTP.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument("--catalog_path", type=str, default=CATALOG_PATH, help="Path to the course catalog.")
+    parser.add_argument("--window_ms", type=float, default=BATCH_WINDOW_MS, help="Micro-batching window for query embeddings.")
+    parser.add_argument("--max_batch_size", type=int, default=MAX_BATCH_SIZE, help="Largest batch of queries encoded at once.")
+    args = parser.parse_args()
+
+    # Load the model, index and catalog before accepting requests
+    catalog = load_catalog(args.catalog_path).warm()
+    get_hybrid_searcher(catalog).semantic_search("warm up", 1)
+    course_rows(catalog)
+
+    uvicorn.run(create_app(args.catalog_path, args.window_ms, args.max_batch_size), host=args.host, port=args.port)
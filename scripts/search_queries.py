@@ -1,46 +1,548 @@
-import faiss
-import numpy as np
-from sentence_transformers import SentenceTransformer
-
-# Function to load the FAISS index and embeddings
-def load_faiss_index(index_path, embeddings_path):
-    print("Loading FAISS index and embeddings...")
-    index = faiss.read_index(index_path)
-    embeddings = np.load(embeddings_path)
-    return index, embeddings
-
-# Function to perform similarity search
-def search_courses(query, index, embeddings, top_k=5):
-    # Embed the query using the same model used for embedding courses
-    model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
-    query_embedding = model.encode([query])
-
-    # Perform the search in the FAISS index
-    _, indices = index.search(query_embedding, top_k)
-    
-    # Get the results from the course embeddings
-    search_results = []
-    for idx in indices[0]:
-        search_results.append(embeddings[idx])
-    
-    return search_results
-
-# Main function to test search functionality
-if __name__ == "__main__":
-    # Define file paths
-    index_path = "vector_store/course_index.index"
-    embeddings_path = "vector_store/course_embeddings.npy"
-    
-    # Load index and embeddings
-    index, embeddings = load_faiss_index(index_path, embeddings_path)
-    
-    # Example query
-    query = "data analysis with Python"
-    
-    # Perform search
-    results = search_courses(query, index, embeddings, top_k=5)
-    
-    # Display the top search results
-    print("Top 5 similar courses to the query:")
-    for i, result in enumerate(results):
-        print(f"Result {i+1}: {result}")
+import faiss
+import numpy as np
+import os
+import psutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from sentence_transformers import SentenceTransformer
+from course_store import METADATA_COLUMNS, STORE_PATH, CourseStore, course_ids
+
+# The typed catalog and the BM25 keyword index live in app/; make app/ importable
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+from catalog import load_catalog
+from text_index import build_text_index
+
+# Defaults shared with scripts/generate_embeddings.py and the Streamlit app
+MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+INDEX_PATH = "vector_store/course_index.index"
+EMBEDDINGS_PATH = "vector_store/course_embeddings.npy"
+CATALOG_PATH = "data/courses_data_final.parquet"
+
+# Hybrid search: candidates taken from each retriever, and the reciprocal rank
+# fusion constant (60, as in the original RRF paper, damps the weight of top ranks)
+HYBRID_CANDIDATES = 50
+RRF_K = 60
+
+# Threads running the semantic stage of hybrid searches; the pool is shared by
+# every HybridSearcher, so concurrent users overlap and catalog reloads add no threads
+SEMANTIC_STAGE_WORKERS = 8
+
+# Read flags for memory-mapping an index instead of copying it into process memory,
+# tried in order: IO_FLAG_MMAP_IFC maps the codes of flat and HNSW indexes (FAISS >= 1.8),
+# IO_FLAG_MMAP maps IVF inverted lists (the two cannot be combined for IVF).
+# Mapped pages live in the OS page cache, shared by every process.
+MMAP_FLAGS = [faiss.IO_FLAG_MMAP | getattr(faiss, 'IO_FLAG_MMAP_IFC', 0), faiss.IO_FLAG_MMAP]
+
+# Models are expensive to load, so keep one instance per model name for the whole process
+_models = {}
+_models_lock = threading.Lock()
+
+def get_model(model_name=MODEL_NAME):
+    """Return the process-wide SentenceTransformer for `model_name`, loading it on first use."""
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                print(f"Loading embedding model {model_name}...")
+                model = SentenceTransformer(model_name)
+                _models[model_name] = model
+    return model
+
+_semantic_executor = None
+_semantic_executor_lock = threading.Lock()
+
+def get_semantic_executor():
+    """Return the process-wide thread pool for the semantic stage of hybrid searches."""
+    global _semantic_executor
+    if _semantic_executor is None:
+        with _semantic_executor_lock:
+            if _semantic_executor is None:
+                _semantic_executor = ThreadPoolExecutor(max_workers=SEMANTIC_STAGE_WORKERS,
+                                                        thread_name_prefix="semantic-stage")
+    return _semantic_executor
+
+def memory_usage_mb():
+    """
+    Resident memory of this process in MB as a dict with `rss`, `file` (file-backed
+    pages such as memory-mapped indexes, shareable between processes) and `anon`
+    (private memory). The split uses psutil's `shared` field, which only Linux
+    reports; elsewhere `file` and `anon` are None.
+    """
+    info = psutil.Process(os.getpid()).memory_info()
+    rss = info.rss / (1024 ** 2)
+    shared = getattr(info, 'shared', None)
+    if shared is None:
+        return {'rss': rss, 'file': None, 'anon': None}
+    return {'rss': rss, 'file': shared / (1024 ** 2), 'anon': rss - shared / (1024 ** 2)}
+
+def format_memory_usage(usage):
+    """One-line summary of `memory_usage_mb()`."""
+    if usage['file'] is None:
+        return f"RSS {usage['rss']:.1f} MB"
+    return f"RSS {usage['rss']:.1f} MB ({usage['file']:.1f} MB file-backed, {usage['anon']:.1f} MB private)"
+
+def read_index(index_path, mmap=True):
+    """
+    Read a FAISS index, memory-mapped when `mmap` is set. Index types that cannot
+    be mapped are read into memory instead.
+    """
+    if mmap:
+        for flags in MMAP_FLAGS:
+            try:
+                return faiss.read_index(index_path, flags)
+            except RuntimeError as e:
+                error = e
+        print(f"Cannot memory-map {index_path} ({error}); reading it into memory.")
+    return faiss.read_index(index_path)
+
+# Function to load the FAISS index and embeddings
+def load_faiss_index(index_path, embeddings_path, mmap=True):
+    print("Loading FAISS index and embeddings...")
+    start = time.perf_counter()
+    index = read_index(index_path, mmap)
+    embeddings = np.load(embeddings_path, mmap_mode='r' if mmap else None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Loaded {index.ntotal} vectors in {elapsed_ms:.1f} ms; {format_memory_usage(memory_usage_mb())}")
+    return index, embeddings
+
+# Function to perform similarity search
+def search_courses(query, index, embeddings, top_k=5):
+    # Embed the query using the same model used for embedding courses
+    model = get_model()
+    query_embedding = model.encode([query])
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        faiss.normalize_L2(query_embedding)  # A cosine index holds normalized vectors
+
+    # Perform the search in the FAISS index
+    _, indices = index.search(query_embedding, top_k)
+
+    # Get the results from the course embeddings
+    search_results = []
+    for idx in indices[0]:
+        search_results.append(embeddings[idx])
+
+    return search_results
+
+
+class CourseSearcher:
+    """
+    Semantic search over the course catalog.
+    The model, index and catalog are loaded lazily on first use, and query
+    embeddings are kept in a bounded LRU cache so repeated queries skip the model.
+    Course ids are the stable ids kept in the metadata store written by
+    generate_embeddings.py, and hits are resolved through that store. Long courses
+    are indexed as several passages; their hits are pooled into one course score
+    (the best passage). For a vector
+    store built before the metadata store existed, FAISS ids are catalog row
+    positions and metadata is read from the catalog CSV instead.
+    With `mmap` (the default) the index is memory-mapped, so search processes
+    on one machine share a single copy of the vectors in the page cache.
+    """
+
+    def __init__(self, index_path=INDEX_PATH, catalog_path=CATALOG_PATH, model_name=MODEL_NAME,
+                 cache_size=1024, courses=None, store_path=STORE_PATH, mmap=True):
+        self.index_path = index_path
+        self.catalog_path = catalog_path
+        self.store_path = store_path
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self.mmap = mmap
+        self.load_ms = None
+        self._index = None
+        self._store = None
+        self._passage_courses = None
+        self._vector_ids = None
+        self._vector_course_ids = None
+        self._courses = courses
+        self._records = None
+        self._texts = None
+        self._load_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def model(self):
+        return get_model(self.model_name)
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._load_lock:
+                if self._index is None:
+                    print(f"Loading FAISS index from {self.index_path}...")
+                    start = time.perf_counter()
+                    self._index = read_index(self.index_path, self.mmap)
+                    self.load_ms = (time.perf_counter() - start) * 1000
+                    print(f"Loaded {self._index.ntotal} vectors in {self.load_ms:.1f} ms; "
+                          f"{format_memory_usage(memory_usage_mb())}")
+        return self._index
+
+    @property
+    def store(self):
+        """The metadata store, or None for a vector store built without one."""
+        if self._store is None:
+            with self._load_lock:
+                if self._store is None:
+                    exists = self.store_path and os.path.exists(self.store_path)
+                    self._store = CourseStore(self.store_path) if exists else False
+        return self._store or None
+
+    @property
+    def courses(self):
+        if self._courses is None:
+            with self._load_lock:
+                if self._courses is None:
+                    self._courses = load_catalog(self.catalog_path).frame
+        return self._courses
+
+    @property
+    def passage_courses(self):
+        """(passage ids, course ids) sorted by passage id, or None when every course has one vector."""
+        if self._passage_courses is None:
+            store = self.store
+            with self._load_lock:
+                if self._passage_courses is None:
+                    mapping = store.passage_courses() if store is not None else None
+                    self._passage_courses = mapping if mapping is not None and len(mapping[0]) else False
+        return self._passage_courses or None
+
+    def course_ids_of(self, vector_ids):
+        """Course id of each FAISS hit; long courses are indexed as several passages."""
+        mapping = self.passage_courses
+        if mapping is None:
+            return vector_ids
+        passages, courses = mapping
+        positions = np.minimum(np.searchsorted(passages, vector_ids), len(passages) - 1)
+        return np.where(passages[positions] == vector_ids, courses[positions], vector_ids)
+
+    def catalog_ids(self, courses):
+        """Course ids of the rows of a catalog frame, e.g. to build `allowed_ids` from filtered rows."""
+        if self.store is None:
+            return courses.index.to_numpy()
+        return course_ids(courses['course_url'].where(courses['course_url'].notna(), courses['course_title']))
+
+    def _course_records(self, ids):
+        """Metadata for each course id, in order, without touching the catalog when a store exists."""
+        if self.store is not None:
+            return self.store.get_many(ids)
+        if self._records is None:
+            self._records = self.courses[METADATA_COLUMNS].to_dict('records')
+        return [self._records[i] for i in ids]
+
+    def course_texts(self, ids):
+        """Title and description of each course id, in order: the text a re-ranker reads."""
+        if self._texts is None:
+            courses = self.courses
+            texts = courses['course_title'].fillna("") + ". " + courses['course_description'].fillna("")
+            self._texts = dict(zip(self.catalog_ids(courses).tolist(), texts))
+        return [self._texts.get(int(i), "") for i in ids]
+
+    def embed(self, queries):
+        """
+        Encode `queries` into a float32 matrix, one row per query.
+        Cached queries are reused and all misses are encoded in a single batch.
+        """
+        vectors = [None] * len(queries)
+        missing = OrderedDict()  # query -> positions, deduplicated in first-seen order
+        with self._cache_lock:
+            for i, query in enumerate(queries):
+                vector = self._cache.get(query)
+                if vector is not None:
+                    self._cache.move_to_end(query)
+                    vectors[i] = vector
+                    self._hits += 1
+                else:
+                    missing.setdefault(query, []).append(i)
+                    self._misses += 1
+
+        if missing:
+            encoded = self.model.encode(list(missing), show_progress_bar=False).astype('float32')
+            with self._cache_lock:
+                for (query, positions), vector in zip(missing.items(), encoded):
+                    for i in positions:
+                        vectors[i] = vector
+                    self._cache[query] = vector
+                    self._cache.move_to_end(query)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        if not vectors:
+            return np.zeros((0, self.index.d), dtype='float32')
+        return np.vstack(vectors)
+
+    def cache_info(self):
+        """Query-embedding cache statistics: hits, misses, maxsize and currsize."""
+        with self._cache_lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'maxsize': self.cache_size, 'currsize': len(self._cache)}
+
+    @property
+    def vector_ids(self):
+        """FAISS id of every vector in the index's internal order (the positions a search selector sees)."""
+        if self._vector_ids is None:
+            index = self.index
+            with self._load_lock:
+                if self._vector_ids is None:
+                    if isinstance(index, faiss.IndexIDMap):
+                        self._vector_ids = faiss.vector_to_array(index.id_map).astype('int64')
+                    else:
+                        self._vector_ids = np.arange(index.ntotal, dtype='int64')
+        return self._vector_ids
+
+    @property
+    def vector_course_ids(self):
+        """Course id of every vector in the index's internal order."""
+        if self._vector_course_ids is None:
+            self._vector_course_ids = self.course_ids_of(self.vector_ids)
+        return self._vector_course_ids
+
+    def catalog_positions(self, courses):
+        """
+        Row position in `courses` of the course behind every vector, or -1 for
+        vectors of courses not in the frame. A boolean mask over the catalog rows
+        (such as the sidebar facet masks) then becomes a selector bitmap over the
+        vectors with a single gather: `mask[positions] & (positions >= 0)`.
+        """
+        ids = self.catalog_ids(courses)
+        positions = np.full(len(self.vector_course_ids), -1, dtype='int64')
+        if len(ids) == 0:
+            return positions
+        order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[order]
+        found = np.minimum(np.searchsorted(sorted_ids, self.vector_course_ids), len(ids) - 1)
+        matched = sorted_ids[found] == self.vector_course_ids
+        positions[matched] = order[found[matched]]
+        return positions
+
+    def _search(self, query_embeddings, k, allowed_vectors=None):
+        """
+        FAISS search returning (distances, FAISS ids). With `allowed_vectors`, a
+        boolean mask over the internal vector positions, only those vectors are
+        considered: the mask is passed to FAISS as an IDSelectorBitmap, so a
+        filtered search still returns a full top-k without over-fetching.
+        """
+        index = self.index
+        if allowed_vectors is None:
+            return index.search(query_embeddings, k)
+
+        # Selectors see internal positions; search the index inside the id map and translate back
+        inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+        bitmap = np.packbits(allowed_vectors, bitorder='little')
+        selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+        if isinstance(inner, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(inner.hnsw.efSearch, k))
+        elif isinstance(inner, faiss.IndexIVF):
+            # Probed lists hold about nprobe / nlist of the allowed vectors; probe
+            # enough lists that k of them are expected to be visited
+            allowed_count = max(int(allowed_vectors.sum()), 1)
+            nprobe = max(inner.nprobe, int(np.ceil(2 * k * inner.nlist / allowed_count)))
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=min(nprobe, inner.nlist))
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        distances, positions = inner.search(query_embeddings, k, params=params)
+        ids = np.where(positions >= 0, self.vector_ids[np.maximum(positions, 0)], -1)
+        return distances, ids
+
+    def rank_many(self, queries, top_k=5, allowed_ids=None, allowed_vectors=None, query_embeddings=None):
+        """
+        Return one (course_ids, scores) pair per query, best match first.
+        If `allowed_ids` (course ids) or `allowed_vectors` (a boolean mask over the
+        index's vectors, see `catalog_positions`) is given, only those courses are
+        searched: the filter is applied inside FAISS, so every query gets `top_k`
+        hits as long as that many courses are allowed.
+        Scores are 1 / (1 + L2 distance) for an L2 index and the cosine similarity
+        for an inner-product (cosine) index; higher is better either way.
+        `query_embeddings` may hold vectors already encoded for `queries` (e.g. by
+        a micro-batcher); otherwise they come from `embed`.
+        """
+        index = self.index
+        if query_embeddings is None:
+            query_embeddings = self.embed(queries)
+        if len(queries) == 0:
+            return []
+
+        cosine = index.metric_type == faiss.METRIC_INNER_PRODUCT
+        if cosine:
+            # Normalize a copy; the cached embeddings stay as the model returned them
+            query_embeddings = np.array(query_embeddings, dtype='float32')
+            faiss.normalize_L2(query_embeddings)
+
+        if allowed_ids is not None and allowed_vectors is None:
+            allowed_vectors = np.isin(self.vector_course_ids, np.asarray(list(allowed_ids), dtype='int64'))
+        searchable = index.ntotal
+        if allowed_vectors is not None:
+            searchable = int(allowed_vectors.sum())
+            top_k = min(top_k, len(np.unique(self.vector_course_ids[allowed_vectors])))
+            if top_k == 0:
+                empty = (np.zeros(0, dtype='int64'), np.zeros(0, dtype='float32'))
+                return [empty for _ in queries]
+
+        # A course with several passages can fill several hits; fetch deeper so
+        # enough distinct courses remain after pooling
+        k = min(searchable, top_k if self.passage_courses is None else top_k * 4)
+        while True:
+            distances, ids = self._search(query_embeddings, k, allowed_vectors)
+            results = []
+            for row_ids, row_distances in zip(ids, distances):
+                keep = row_ids >= 0
+                row_ids = self.course_ids_of(row_ids[keep])
+                row_scores = row_distances[keep] if cosine else 1.0 / (1.0 + row_distances[keep])
+                # Pool passages by max: hits are best-first, so a course's first hit is its best passage
+                _, first = np.unique(row_ids, return_index=True)
+                first.sort()
+                results.append((row_ids[first][:top_k], row_scores[first][:top_k]))
+            if k >= searchable or all(len(row_ids) == top_k for row_ids, _ in results):
+                return results
+            k = min(searchable, k * 2)
+
+    def search_many(self, queries, top_k=5, allowed_ids=None, reranker=None, return_stats=False):
+        """
+        Search several queries in one pass: one batched encode and one FAISS search.
+        Returns a list of hit lists; each hit is a dict with `course_id`, `score`
+        and the catalog metadata columns. With a `reranker` (see rerank.py), its
+        top candidates are re-scored per query and hits gain a `rerank_score`.
+        With `return_stats`, returns (hit lists, rerank stats per query), where the
+        stats are the reranker's (added latency, cache use, fallback) or None.
+        """
+        fetch = max(top_k, reranker.candidates) if reranker is not None else top_k
+        results, all_stats = [], []
+        for query, (hit_ids, scores) in zip(queries, self.rank_many(queries, fetch, allowed_ids)):
+            records = self._course_records(hit_ids.tolist())
+            hits = [
+                {**(record or {}), 'course_id': int(course_id), 'score': float(score)}
+                for course_id, score, record in zip(hit_ids, scores, records)
+            ]
+            stats = None
+            if reranker is not None:
+                hits, stats = reranker.rerank(query, hits, self.course_texts(hit_ids.tolist()))
+            results.append(hits[:top_k])
+            all_stats.append(stats)
+        return (results, all_stats) if return_stats else results
+
+    def search(self, query, top_k=5, allowed_ids=None, reranker=None, return_stats=False):
+        """Search a single query; see `search_many`."""
+        results, all_stats = self.search_many([query], top_k, allowed_ids, reranker, return_stats=True)
+        return (results[0], all_stats[0]) if return_stats else results[0]
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Fuse several best-first rankings of ids: every id scores the sum of
+    1 / (k + rank) over the rankings it appears in, with ranks starting at 1.
+    Returns (ids, scores), best first; ties keep the order ids were first seen.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    ids = sorted(scores, key=lambda item: -scores[item])
+    return np.asarray(ids, dtype='int64'), np.asarray([scores[item] for item in ids], dtype='float64')
+
+
+class HybridSearcher:
+    """
+    Keyword and semantic search over one catalog frame, fused with reciprocal
+    rank fusion. The BM25 index catches exact terms such as tool names
+    ("MECE", "LangChain"); the FAISS index catches paraphrases. Both stages
+    run in parallel and their timings are returned with every result.
+    Results are row positions in `courses`.
+    """
+
+    def __init__(self, courses, searcher=None, text_index=None, candidates=HYBRID_CANDIDATES, rrf_k=RRF_K):
+        self.courses = courses
+        self.searcher = searcher or CourseSearcher(courses=courses)
+        self.text_index = text_index if text_index is not None else build_text_index(courses)
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self._ids = self.searcher.catalog_ids(courses)
+        self._position_of = {course_id: position for position, course_id in enumerate(self._ids.tolist())}
+        self._vector_rows = self.searcher.catalog_positions(courses)
+
+    def position_of(self, course_id):
+        """Row position in `courses` of a course id, or None."""
+        return self._position_of.get(int(course_id))
+
+    def _lexical(self, query, allowed):
+        start = time.perf_counter()
+        rows, _ = self.text_index.search(query, top_k=self.candidates, allowed=allowed, match_all=False)
+        return rows, (time.perf_counter() - start) * 1000
+
+    def semantic_search(self, query, top_k=10, allowed=None, query_embedding=None):
+        """
+        Semantic stage on its own: (row positions, scores) best first. `allowed`
+        is an optional boolean mask over the rows; it is turned into a bitmap over
+        the index's vectors, so FAISS only visits courses that pass the filters.
+        `query_embedding` skips encoding the query when it is already known.
+        """
+        allowed_vectors = self._vector_rows >= 0
+        if allowed is not None:
+            allowed_vectors &= np.asarray(allowed, dtype=bool)[np.maximum(self._vector_rows, 0)]
+        query_embeddings = None if query_embedding is None else np.asarray(query_embedding, dtype='float32')[None, :]
+        hit_ids, scores = self.searcher.rank_many([query], top_k, allowed_vectors=allowed_vectors,
+                                                  query_embeddings=query_embeddings)[0]
+        rows = np.asarray([self._position_of[i] for i in hit_ids.tolist()], dtype='int64')
+        return rows, scores
+
+    def _semantic(self, query, allowed):
+        start = time.perf_counter()
+        rows, _ = self.semantic_search(query, self.candidates, allowed)
+        return rows, (time.perf_counter() - start) * 1000
+
+    def search(self, query, top_k=10, allowed=None):
+        """
+        Return (row positions, fused scores, timings) for `query`, best first.
+        `allowed` is an optional boolean mask over the rows, e.g. the sidebar filters.
+        Timings are in milliseconds per stage (lexical, semantic, fusion) and in total.
+        """
+        start = time.perf_counter()
+        semantic = get_semantic_executor().submit(self._semantic, query, allowed)
+        lexical_rows, lexical_ms = self._lexical(query, allowed)
+        semantic_rows, semantic_ms = semantic.result()
+
+        fusion_start = time.perf_counter()
+        rows, scores = reciprocal_rank_fusion([lexical_rows.tolist(), semantic_rows.tolist()], self.rrf_k)
+        rows, scores = rows[:top_k], scores[:top_k]
+        end = time.perf_counter()
+
+        timings = {
+            'lexical_ms': lexical_ms,
+            'semantic_ms': semantic_ms,
+            'fusion_ms': (end - fusion_start) * 1000,
+            'total_ms': (end - start) * 1000,
+        }
+        return rows, scores, timings
+
+
+# Main function to test search functionality
+if __name__ == "__main__":
+    searcher = CourseSearcher()
+
+    # Example queries
+    queries = ["data analysis with Python", "introduction to generative AI"]
+
+    # Perform search for all queries in one batch
+    all_results = searcher.search_many(queries, top_k=5)
+
+    # Display the top search results
+    for query, results in zip(queries, all_results):
+        print(f"Top {len(results)} courses for: {query}")
+        for i, result in enumerate(results):
+            print(f"Result {i+1}: {result['course_title']} (id={result['course_id']}, score={result['score']:.3f})")
+
+    # Hybrid search finds exact tool names that embeddings alone can miss
+    hybrid = HybridSearcher(searcher.courses, searcher)
+    for query in ["MECE", "LangChain agents"]:
+        rows, scores, timings = hybrid.search(query, top_k=5)
+        print(f"Hybrid results for: {query} "
+              f"(lexical {timings['lexical_ms']:.1f} ms, semantic {timings['semantic_ms']:.1f} ms, "
+              f"fusion {timings['fusion_ms']:.2f} ms, total {timings['total_ms']:.1f} ms)")
+        for i, (row, score) in enumerate(zip(rows, scores)):
+            print(f"Result {i+1}: {searcher.courses['course_title'].iloc[row]} (rrf={score:.4f})")
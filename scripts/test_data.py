@@ -1,58 +1,90 @@
-import pandas as pd
-import numpy as np
-from sentence_transformers import SentenceTransformer
-
-# Function to test data quality by checking for missing values
-def test_data_quality(csv_file_path):
-    print("Testing data quality...")
-    try:
-        # Try reading with a different encoding
-        data = pd.read_csv(csv_file_path, encoding='ISO-8859-1')
-    except UnicodeDecodeError as e:
-        print(f"Error reading the file with encoding 'ISO-8859-1': {e}")
-        print("Trying with utf-16 encoding...")
-        data = pd.read_csv(csv_file_path, encoding='utf-16')
-
-    # Check for missing values
-    missing_data = data.isnull().sum()
-    print("Missing data in each column:")
-    print(missing_data)
-    
-    # Ensure there are no empty or invalid entries in key fields like course_title
-    invalid_entries = data[data['course_title'].isnull() | (data['course_title'] == '')]
-    print(f"Found {len(invalid_entries)} invalid course titles.")
-    
-    return data
-
-# Function to validate embeddings by checking their size
-def test_embeddings(embeddings_path, data):
-    print("Testing embeddings...")
-    embeddings = np.load(embeddings_path)
-    
-    # Check that embeddings match the number of courses
-    if embeddings.shape[0] != len(data):
-        print(f"Error: Number of embeddings ({embeddings.shape[0]}) does not match number of courses ({len(data)}).")
-    else:
-        print(f"Embeddings validated: {embeddings.shape[0]} embeddings match {len(data)} courses.")
-    
-    # Check embedding dimensions (should be consistent with model output)
-    embedding_dim = embeddings.shape[1]
-    print(f"Embedding dimension: {embedding_dim}")
-    
-    return embeddings
-
-# Main function to run data and embedding validation
-if __name__ == "__main__":
-    # Define file paths
-    csv_file_path = r"F:\MyProjects_YJ\smart_search_tool\data\courses_data_final.csv"  # Input CSV path
-    embeddings_path = r"F:\MyProjects_YJ\smart_search_tool\vector_store\course_embeddings.npy"  # Embeddings path
-    
-    # Test data quality
-    data = test_data_quality(csv_file_path)
-    
-    # Test embeddings
-    embeddings = test_embeddings(embeddings_path, data)
-    
-    # Optionally, test if embeddings and data match (for example, by checking the first row)
-    print("First course title:", data.iloc[0]['course_title'])
-    print("First embedding shape:", embeddings[0].shape)
+import argparse
+import pandas as pd
+import numpy as np
+import os
+import sys
+from course_store import STORE_PATH, CourseStore, course_ids
+
+# The catalog schema lives in app/catalog.py; make app/ importable
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+from catalog import DATA_PATH, read_catalog
+
+# Function to test data quality by checking for missing values
+def test_data_quality(catalog_path):
+    print("Testing data quality...")
+    # Typed Parquet catalog (see build_catalog.py); a scraped CSV is typed the same way
+    data = read_catalog(catalog_path)
+
+    # Check for missing values
+    missing_data = data.isnull().sum()
+    print("Missing data in each column:")
+    print(missing_data)
+    
+    # Ensure there are no empty or invalid entries in key fields like course_title
+    invalid_entries = data[data['course_title'].isnull() | (data['course_title'] == '')]
+    print(f"Found {len(invalid_entries)} invalid course titles.")
+    
+    return data
+
+# Function to validate embeddings by checking their size
+def test_embeddings(embeddings_path, data):
+    print("Testing embeddings...")
+    embeddings = np.load(embeddings_path)
+    
+    # Check that every course can have an embedding (long courses are split into several passages)
+    if embeddings.shape[0] < len(data):
+        print(f"Error: Fewer embeddings ({embeddings.shape[0]}) than courses ({len(data)}).")
+    else:
+        print(f"Embeddings validated: {embeddings.shape[0]} passage embeddings for {len(data)} courses.")
+    
+    # Check embedding dimensions (should be consistent with model output)
+    embedding_dim = embeddings.shape[1]
+    print(f"Embedding dimension: {embedding_dim}")
+    
+    return embeddings
+
+# Function to validate the metadata store against the course data by stable course id
+def check_metadata_store(store_path, data):
+    print("Testing metadata store...")
+    if not os.path.exists(store_path):
+        print(f"No metadata store at {store_path}; FAISS ids are row positions.")
+        return
+
+    store = CourseStore(store_path)
+    ids = course_ids(data['course_url'].where(data['course_url'].notna(), data['course_title']))
+    records = store.get_many(ids)
+    missing = [url for url, record in zip(data['course_url'], records) if record is None]
+    mismatched = [
+        url for url, title, record in zip(data['course_url'], data['course_title'], records)
+        if record is not None and record['course_title'] != title
+    ]
+    print(f"Store holds {len(store)} courses; {len(missing)} courses missing, {len(mismatched)} with a different title.")
+    mapping = store.passage_courses()
+    if mapping is not None:
+        without_passages = np.setdiff1d(ids, mapping[1])
+        print(f"{len(mapping[0])} passages indexed; {len(without_passages)} courses without a passage.")
+    store.close()
+
+# Main function to run data and embedding validation
+if __name__ == "__main__":
+    # File paths default to the repository layout (run from the repository root)
+    parser = argparse.ArgumentParser(description="Validate the course catalog, its embeddings and the metadata store.")
+    parser.add_argument("--catalog_path", type=str, default=DATA_PATH, help="Path to the typed course catalog.")
+    parser.add_argument("--embeddings_path", type=str, default="vector_store/course_embeddings.npy", help="Path to the embeddings.")
+    parser.add_argument("--store_path", type=str, default=STORE_PATH, help="Path to the metadata store.")
+    args = parser.parse_args()
+    
+    # Test data quality
+    data = test_data_quality(args.catalog_path)
+    
+    # Test embeddings
+    embeddings = test_embeddings(args.embeddings_path, data)
+
+    # Test metadata store
+    check_metadata_store(args.store_path, data)
+    
+    # Optionally, test if embeddings and data match (for example, by checking the first row)
+    print("First course title:", data.iloc[0]['course_title'])
+    print("First embedding shape:", embeddings[0].shape)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The app and the scripts import their modules by name; make both importable
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("app", "scripts"):
+    path = os.path.join(ROOT_DIR, directory)
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scrape_courses import Fetcher, HostRateLimiter, PageCache, create_session
+
+SLOW_PAGE_SECONDS = 0.2
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the course site. It records when every request arrived
+    and how many were in flight at once. Paths:
+    /slow/<n>             answers after SLOW_PAGE_SECONDS
+    /fail/<status>/<n>/x  answers <status> to the first <n> requests, then 200
+    /etag                 answers 304 when If-None-Match carries its ETag
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.arrivals = []
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.conditional_requests = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.arrivals.append((self.path, time.monotonic()))
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            parts = self.path.strip("/").split("/")
+            if parts[0] == "slow":
+                time.sleep(SLOW_PAGE_SECONDS)
+                self._send(200, f"<html>{self.path}</html>".encode())
+            elif parts[0] == "fail":
+                status, failures = int(parts[1]), int(parts[2])
+                if hits <= failures:
+                    self._send(status, headers=[("Retry-After", "0")] if status == 429 else [])
+                else:
+                    self._send(200, b"<html>recovered</html>")
+            elif parts[0] == "etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    with server.lock:
+                        server.conditional_requests += 1
+                    self._send(304, headers=[("ETag", '"v1"')])
+                else:
+                    self._send(200, b"<html>course v1</html>", headers=[("ETag", '"v1"')])
+            else:
+                self._send(404)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(rate=0, retries=3, pool_size=8, cache=None):
+    rate_limiter = HostRateLimiter(rate)
+    session = create_session(pool_size=pool_size, retries=retries, backoff_factor=0, rate_limiter=rate_limiter)
+    return Fetcher(session, rate_limiter, timeout=5, cache=cache)
+
+
+def test_pages_are_fetched_concurrently(server):
+    fetcher = make_fetcher()
+    urls = [f"{server.url}/slow/{i}" for i in range(8)]
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pages = list(executor.map(fetcher.get, urls))
+    elapsed = time.monotonic() - start
+
+    assert [page.status_code for page in pages] == [200] * 8
+    assert [page.text for page in pages] == [f"<html>/slow/{i}</html>" for i in range(8)]
+    assert server.max_in_flight > 1
+    assert elapsed < 8 * SLOW_PAGE_SECONDS / 2
+
+
+@pytest.mark.parametrize("status", [503, 429])
+def test_retryable_statuses_are_retried(server, status):
+    page = make_fetcher().get(f"{server.url}/fail/{status}/2/page")
+
+    assert page.status_code == 200
+    assert page.text == "<html>recovered</html>"
+    assert server.hits[f"/fail/{status}/2/page"] == 3
+
+
+def test_retries_give_up_with_the_last_response(server):
+    page = make_fetcher(retries=2).get(f"{server.url}/fail/503/10/page")
+
+    assert page.status_code == 503
+    assert server.hits["/fail/503/10/page"] == 3
+
+
+def test_rate_limit_spaces_first_attempts(server):
+    rate = 20
+    fetcher = make_fetcher(rate=rate)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(fetcher.get, [f"{server.url}/slow/{i}" for i in range(6)]))
+
+    arrivals = sorted(arrived for _, arrived in server.arrivals)
+    assert min(b - a for a, b in zip(arrivals, arrivals[1:])) >= 0.8 / rate
+
+
+def test_rate_limit_applies_to_retries(server):
+    rate = 10
+    page = make_fetcher(rate=rate).get(f"{server.url}/fail/503/3/page")
+
+    assert page.status_code == 200
+    arrivals = [arrived for _, arrived in server.arrivals]
+    assert len(arrivals) == 4
+    assert min(b - a for a, b in zip(arrivals, arrivals[1:])) >= 0.8 / rate
+
+
+def test_unchanged_page_is_revalidated_with_etag(server, tmp_path):
+    fetcher = make_fetcher(cache=PageCache(str(tmp_path)))
+    url = f"{server.url}/etag"
+
+    first = fetcher.get(url)
+    assert first.changed and first.parsed is None
+    fetcher.store_parsed(url, {"course_title": "Course v1"})
+
+    second = fetcher.get(url)
+    assert server.conditional_requests == 1
+    assert second.status_code == 200
+    assert second.text == first.text
+    assert not second.changed
+    assert second.parsed == {"course_title": "Course v1"}
@@ -0,0 +1,112 @@
+import glob
+import hashlib
+import os
+
+import pytest
+import requests
+
+import scrape_courses
+from scrape_courses import (
+    MISSING_DETAILS, PARSER_VERSION, PARSERS, Fetcher, HostRateLimiter, PageCache, ParsePipeline,
+    ReplayFetcher, parse_course_html, scrape_all_courses,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+BASE_URL = "https://courses.analyticsvidhya.com/collections/courses"
+COURSES_URL = "https://courses.analyticsvidhya.com/courses/"
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def fixture_urls():
+    """URL -> fixture file of every recorded page: listing_page<n>.html and course_<slug>.html."""
+    urls = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        name = os.path.basename(path)
+        stem = os.path.splitext(name)[0]
+        if stem.startswith("listing_page"):
+            urls[f"{BASE_URL}?page={stem[len('listing_page'):]}"] = name
+        else:
+            urls[COURSES_URL + stem[len("course_"):]] = name
+    return urls
+
+
+@pytest.fixture
+def recorded_cache(tmp_path):
+    """A PageCache holding the fixture pages, as a scrape with the page cache would have recorded them."""
+    cache = PageCache(str(tmp_path))
+    for url, name in fixture_urls().items():
+        body = read_fixture(name)
+        cache.put(url, {
+            'url': url,
+            'etag': None,
+            'last_modified': None,
+            'content_hash': hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            'body': body,
+            'parsed': None,
+        })
+    return cache
+
+
+def course_urls():
+    return [url for url in fixture_urls() if url.startswith(COURSES_URL)]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_pipeline_matches_serial_parse(recorded_cache, parser):
+    urls = course_urls() + [COURSES_URL + "never-recorded"]
+    expected = [parse_course_html(read_fixture(fixture_urls()[url]), parser) for url in urls[:-1]]
+    expected.append(MISSING_DETAILS)
+
+    with ParsePipeline(ReplayFetcher(recorded_cache), fetch_workers=4, parse_workers=2, parser=parser,
+                       max_pending=1) as pipeline:
+        details = pipeline.parse_course_pages(urls)
+
+    assert details == expected
+
+
+def test_offline_scrape_with_parse_workers_matches_serial_scrape(recorded_cache):
+    serial = scrape_all_courses(BASE_URL, max_workers=1, fetcher=ReplayFetcher(recorded_cache))
+    pipelined = scrape_all_courses(BASE_URL, max_workers=4, fetcher=ReplayFetcher(recorded_cache), parse_workers=2)
+
+    assert pipelined == serial
+    assert [course['course_title'] for course in serial] == [
+        "Introduction to Python",
+        "Generative AI for Everyone",
+        "Frameworks for Effective Problem Solving",
+        "SQL for Data Analysis",
+        "Coming Soon: Agentic AI",
+    ]
+    assert serial[0]['course_rating'] == '4.8'  # Not the 1.0/5 inside the page's <script>
+    assert serial[0]['course_level'] == 'Beginner'
+    assert serial[3]['course_rating'] == 'N/A'  # Only inside a <template>
+
+
+class NotModifiedSession:
+    """Session stand-in answering every request with 304 Not Modified."""
+
+    def get(self, url, timeout=None, headers=None):
+        response = requests.Response()
+        response.status_code = 304
+        response.url = url
+        response._content = b""
+        return response
+
+
+def test_cached_parse_is_only_reused_for_the_current_parser_version(recorded_cache, monkeypatch):
+    url = course_urls()[0]
+    fetcher = Fetcher(NotModifiedSession(), HostRateLimiter(0), cache=recorded_cache)
+    details = parse_course_html(read_fixture(fixture_urls()[url]))
+
+    assert fetcher.get(url).parsed is None  # Recorded without a parse result
+    fetcher.store_parsed(url, details)
+    assert recorded_cache.get(url)['parser_version'] == PARSER_VERSION
+    assert fetcher.get(url).parsed == details
+
+    monkeypatch.setattr(scrape_courses, "PARSER_VERSION", PARSER_VERSION + 1)
+    page = fetcher.get(url)
+    assert not page.changed
+    assert page.parsed is None
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from stats import FEATURED_COUNT, build_catalog_stats
+
+
+def make_courses():
+    return pd.DataFrame({
+        'course_level': pd.Categorical(
+            ['Beginner', 'Beginner', 'Advanced', None, 'Beginner'],
+            categories=['Advanced', 'Beginner', 'Intermediate'],
+        ),
+        'course_rating': pd.array([4.8, None, 4.5, 3.0, 4.9], dtype='Float64'),
+        'price': pd.Categorical(['Free', 'Free', '$10', 'Free', '$5']),
+    })
+
+
+def test_stats_are_computed_once_per_frame():
+    stats = build_catalog_stats(make_courses())
+
+    assert stats.total == 5
+    assert stats.free_count == 3 and stats.paid_count == 2
+    assert stats.average_rating == np.mean([4.8, 4.5, 3.0, 4.9])
+    assert stats.rating_histogram[0].sum() == 4
+    assert stats.rating_counts[1].tolist() == [1, 1, 1, 1]
+    assert stats.featured_rows.tolist() == [0, 2, 4][:FEATURED_COUNT]
+
+
+def test_level_counts_cover_every_level_category():
+    stats = build_catalog_stats(make_courses())
+
+    assert stats.level_counts == {'Advanced': 1, 'Beginner': 3, 'Intermediate': 0}
+    assert all(type(count) is int for count in stats.level_counts.values())